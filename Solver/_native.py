@@ -0,0 +1,33 @@
+"""C implementation of the MCTS hot loops, JIT-compiled via sgf_tool's
+DynamicLibrary. Falls back are handled by the importer (see tree.py)."""
+
+from sgf_tool import DynamicLibrary as dl
+
+lib = dl.DynamicLibrary()
+lib.compile_string(
+    r'''
+#include <cmath>
+#include <cstdint>
+
+// UCT argmax over one node's children, reading the SoA arrays that
+// SolverNode mirrors for selection. Unvisited children score +inf.
+API int64_t uct_best_child(const double* winrate, const int64_t* visits, int64_t n, double c, double log_np) {
+    int64_t best = -1;
+    double best_score = -1e18;
+    for (int64_t i = 0; i < n; ++i) {
+        int64_t v = visits[i];
+        double score = (v == 0) ? 1e18 : winrate[i] / v + c * sqrt(log_np / v);
+        if (score > best_score) {
+            best_score = score;
+            best = i;
+        }
+    }
+    return best;
+}
+''', functions={
+        'uct_best_child': {'argtypes': [dl.npdoublearr, dl.npint64arr, dl.int64, dl.double, dl.double], 'restype': dl.int64},
+    })
+
+
+def uct_best_child(winrate, visits, c: float, log_np: float) -> int:
+    return lib.uct_best_child(winrate, visits, len(visits), c, log_np)
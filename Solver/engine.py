@@ -1,4 +1,6 @@
 import abc
+import asyncio
+import os
 import typing
 from .solver_node import SolverNode
 from .types import BoardState, EvaluationResult
@@ -14,27 +16,62 @@ class Engine(abc.ABC):
         pass
 
 
+# Maps the NCTU6 result label straight to (score, state) so parsing a
+# result is one dict lookup with no float comparisons or exception path.
+# Only proven wins ("B:w"/"W:w") carry a terminal state.
+_RESULT_TO_SCORE_STATE = {
+    "B:w": (1.0, BoardState.BLACK_WIN),
+    "B:a_w": (0.9, BoardState.UNKNOWN),
+    "a-b:B3": (0.7, BoardState.UNKNOWN),
+    "a-b:B2": (0.5, BoardState.UNKNOWN),
+    "a-b:B1": (0.3, BoardState.UNKNOWN),
+    "a-b:stable": (0.0, BoardState.UNKNOWN),
+    "a-b:unstable": (0.0, BoardState.UNKNOWN),
+    "a-b:w1": (-0.3, BoardState.UNKNOWN),
+    "a-b:w2": (-0.5, BoardState.UNKNOWN),
+    "a-b:w3": (-0.7, BoardState.UNKNOWN),
+    "W:a_w": (-0.9, BoardState.UNKNOWN),
+    "W:w": (-1.0, BoardState.WHITE_WIN),
+}
+
+
+class NCTU6Worker:
+    """A serialized evaluation lane for the NCTU6 executable.
+
+    The shipped NCTU6 binary accepts exactly one -playtsumego job per
+    invocation and exits -- it has no stdin command loop -- so a worker
+    cannot keep a resident process. Instead each worker owns one job lane
+    running at most one subprocess at a time; a set of workers therefore
+    bounds the number of NCTU6 processes alive concurrently.
+    """
+
+    def __init__(self, executable_path: typing.Optional[str] = None):
+        self.executable_path = executable_path
+        self._lock = asyncio.Lock()
+
+    async def run(self, args: typing.List[str]) -> str:
+        from .utils import execute_nctu6_async
+
+        async with self._lock:
+            if self.executable_path:
+                return await execute_nctu6_async(args, executable=self.executable_path)
+            return await execute_nctu6_async(args)
+
+
 class NCTU6Engine(Engine):
     def __init__(self, executable_path: typing.Optional[str] = None):
         self.executable_path = executable_path
+        self.worker = NCTU6Worker(executable_path=executable_path)
 
     def _parse_result(self, output: str) -> EvaluationResult:
-        from .utils import parse_nctu6_output, result_to_winrate
+        from .utils import parse_nctu6_output
 
         result_str, move_nodes, comments = parse_nctu6_output(output)
 
-        score = 0.0
+        score, state = (0.0, BoardState.UNKNOWN)
         if comments:
-            try:
-                score = result_to_winrate(comments[0])
-            except ValueError:
-                pass
-
-        state = BoardState.UNKNOWN
-        if score == 1.0:
-            state = BoardState.BLACK_WIN
-        elif score == -1.0:
-            state = BoardState.WHITE_WIN
+            score, state = _RESULT_TO_SCORE_STATE.get(
+                comments[0], (0.0, BoardState.UNKNOWN))
 
         return EvaluationResult(
             moves=move_nodes,
@@ -60,18 +97,56 @@ class NCTU6Engine(Engine):
 
         return self._parse_result(output)
 
-    async def evaluate_async(self, node: SolverNode, **kwargs) -> EvaluationResult:
-        from .utils import execute_nctu6_async, node_to_job
-
-        job = node_to_job(node)
-        args = ["-playtsumego", job]
+    def _build_args(self, node: SolverNode, kwargs: dict) -> typing.List[str]:
+        from .utils import node_to_job
 
+        args = ["-playtsumego", node_to_job(node)]
         if "ignore" in kwargs:
             args.extend(["-ignore", kwargs["ignore"]])
+        return args
+
+    async def evaluate_async(self, node: SolverNode, **kwargs) -> EvaluationResult:
+        output = await self.worker.run(self._build_args(node, kwargs))
+        return self._parse_result(output)
 
-        if self.executable_path:
-            output = await execute_nctu6_async(args, executable=self.executable_path)
-        else:
-            output = await execute_nctu6_async(args)
 
+class NCTU6EnginePool(NCTU6Engine):
+    """Engine that dispatches evaluations across a pool of NCTU6 worker lanes.
+
+    Idle workers sit in an asyncio.Queue; evaluate_async takes whichever
+    worker is free, runs the job on it and puts it back, so up to
+    n_workers evaluations run in parallel when combined with
+    Solver.solve_async's asyncio.gather batches.
+    """
+
+    def __init__(self, executable_path: typing.Optional[str] = None,
+                 n_workers: typing.Optional[int] = None):
+        super().__init__(executable_path=executable_path)
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        self.n_workers = n_workers
+        self.workers = [NCTU6Worker(executable_path=executable_path)
+                        for _ in range(n_workers)]
+        # Built lazily so the queue is created inside the running event
+        # loop; the loop is remembered because an asyncio.Queue is bound
+        # to it and must be rebuilt when a later solve() runs on a new loop
+        self._idle_workers: typing.Optional[asyncio.Queue] = None
+        self._idle_workers_loop: typing.Optional[asyncio.AbstractEventLoop] = None
+
+    def _worker_queue(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._idle_workers is None or self._idle_workers_loop is not loop:
+            self._idle_workers = asyncio.Queue()
+            self._idle_workers_loop = loop
+            for worker in self.workers:
+                self._idle_workers.put_nowait(worker)
+        return self._idle_workers
+
+    async def evaluate_async(self, node: SolverNode, **kwargs) -> EvaluationResult:
+        queue = self._worker_queue()
+        worker = await queue.get()
+        try:
+            output = await worker.run(self._build_args(node, kwargs))
+        finally:
+            queue.put_nowait(worker)
         return self._parse_result(output)
@@ -1,63 +1,177 @@
+import asyncio
+import collections
 import typing
-from .engine import NCTU6Engine
+from .engine import NCTU6Engine, NCTU6EnginePool
 from .tree import MCTS
 from .types import BoardState, EvaluationResult
-from .utils import node_to_move_string
+from .utils import copy_move_nodes, node_to_move_string, zobrist_hash
 
 class Solver:
 
+    # Maximum number of cached evaluations in the transposition table
+    TT_CAPACITY = 1 << 20
+
     def __init__(self, executable_path: typing.Optional[str] = None):
-        self.engine = NCTU6Engine(executable_path=executable_path)
+        self.engine = NCTU6EnginePool(executable_path=executable_path)
         self.tree = MCTS()
+        # Transposition table: position hash -> cached EvaluationResult.
+        # Different game paths frequently reach identical positions; a hit
+        # skips the whole NCTU6 subprocess call.
+        self.tt: "collections.OrderedDict[int, EvaluationResult]" = collections.OrderedDict()
 
     def set_job(self, job: str):
         self.tree.load_sgf(job)
         # set board state to solve
-        
-    def solve(self, simulations: int = 100):
-        # 1. tree select (MCTS)
-        # 2. call NCTU6 
+
+    def solve(self, simulations: int = 100, batch_size: int = 8):
+        # Synchronous wrapper around solve_async()
+        asyncio.run(self.solve_async(simulations, batch_size=batch_size))
+
+    async def solve_async(self, simulations: int = 100, batch_size: int = 8):
+        # 1. tree select (MCTS), batched with virtual loss
+        # 2. call NCTU6 concurrently (asyncio.gather)
         # 3. expand tree
-        # 4. backpropagate 
+        # 4. backpropagate
         # 5. solve or not?
 
         if not self.tree.root:
             raise ValueError("No job set. Call set_job() first.")
 
-        for i in range(simulations):
-            # 1. Selection (done)
-            leaf = self.tree.selection() 
-            
-            # If leaf is terminal (already solved), we treat it as a result
-            if leaf.status != BoardState.UNKNOWN:
-                score = 1.0 if leaf.status == BoardState.BLACK_WIN else -1.0
-                result = EvaluationResult(
-                    moves=None,
-                    score=score,
-                    state=leaf.status,
-                    info={"comment": "Terminal node revisit"},
-                    raw=""
-                )
-                self.tree.backpropagate(leaf, result)
+        # Cap the number of NCTU6 subprocesses alive at once
+        semaphore = asyncio.Semaphore(batch_size)
+
+        async def evaluate_limited(node, **kwargs):
+            # Only plain evaluations go through the transposition table:
+            # ignore-evaluations depend on the ignore set, not the position
+            # alone.
+            if not kwargs:
+                h = zobrist_hash(node)
+                cached = self._tt_lookup(h)
+                if cached is not None:
+                    return cached
+            async with semaphore:
+                result = await self.engine.evaluate_async(node, **kwargs)
+            if not kwargs:
+                self._tt_store(h, result)
+            return result
+
+        done = 0
+        while done < simulations:
+            # 1. Selection (batched)
+            # Collect up to batch_size distinct leaves. A virtual loss
+            # (visit_count += 1 along the in-flight path) makes the next
+            # selection diverge from paths that are already being evaluated.
+            leaves = []
+            seen = set()
+            while len(leaves) < batch_size and done + len(leaves) < simulations:
+                leaf = self.tree.selection()
+
+                # If leaf is terminal (already solved), we treat it as a result
+                if leaf.status != BoardState.UNKNOWN:
+                    score = 1.0 if leaf.status == BoardState.BLACK_WIN else -1.0
+                    result = EvaluationResult(
+                        moves=None,
+                        score=score,
+                        state=leaf.status,
+                        info={"comment": "Terminal node revisit"},
+                        raw=""
+                    )
+                    self.tree.backpropagate(leaf, result)
+                    done += 1
+                    continue
+
+                if id(leaf) in seen:
+                    # Virtual loss could not push selection away from this
+                    # leaf; evaluating it again in the same batch would only
+                    # expand duplicate children, so stop collecting.
+                    break
+                seen.add(id(leaf))
+
+                self._apply_virtual_loss(leaf)
+                leaves.append(leaf)
+
+            if not leaves:
+                if done >= simulations:
+                    break
                 continue
 
-            # 2. Evaluation
-            result = self.engine.evaluate(leaf)
-            par = leaf.parent
-            if par:
+            # 2. Evaluation (concurrent)
+            # Parent re-evaluations join the same gather as the leaves, one
+            # per distinct parent, and only when the ignore set actually
+            # changed since the parent's last ignore-evaluation.
+            parents = []
+            parent_tasks = []
+            seen_parents = set()
+            for leaf in leaves:
+                par = leaf.parent
+                if par is None or id(par) in seen_parents:
+                    continue
+                seen_parents.add(id(par))
                 # ignore_str = self.tree.collect_child_moves(par).to_sgf(root=NULL)
                 ignore_nodes = self.tree.collect_child_moves(par)
                 ignore_parts = [node_to_move_string(n) for n in ignore_nodes]
+                ignore_hash = hash(frozenset(ignore_parts))
+                if ignore_hash == par._last_ignore_hash:
+                    continue
                 ignore_str = ";" + ";".join(ignore_parts)
-                result2 = self.engine.evaluate(par, ignore=ignore_str)
+                parents.append((par, ignore_hash))
+                parent_tasks.append(evaluate_limited(par, ignore=ignore_str))
+
+            results = await asyncio.gather(
+                *[evaluate_limited(leaf) for leaf in leaves], *parent_tasks)
+
+            for (par, ignore_hash), result2 in zip(parents, results[len(leaves):]):
+                par._last_ignore_hash = ignore_hash
                 self.tree.expand(par, result2)
                 self.tree.backpropagate(par, result2)
 
-            # 3. Expansion
-            self.tree.expand(leaf, result)
-            # 4. Backpropagation
-            self.tree.backpropagate(leaf, result)
-            
+            for leaf, result in zip(leaves, results[:len(leaves)]):
+                self._revert_virtual_loss(leaf)
+                # 3. Expansion
+                self.tree.expand(leaf, result)
+                # 4. Backpropagation
+                self.tree.backpropagate(leaf, result)
+                done += 1
+
             # Check if root is solved
             if self.tree.root.status != BoardState.UNKNOWN:
                 break
+
+    def _tt_lookup(self, h: int) -> typing.Optional[EvaluationResult]:
+        cached = self.tt.get(h)
+        if cached is None:
+            return None
+        self.tt.move_to_end(h)
+        # Return a private copy: expand() re-parents result.moves and
+        # backpropagate() negates result.score in place.
+        return EvaluationResult(
+            moves=copy_move_nodes(cached.moves),
+            score=cached.score,
+            state=cached.state,
+            info=cached.info,
+            raw=cached.raw
+        )
+
+    def _tt_store(self, h: int, result: EvaluationResult):
+        # Store a snapshot before the caller mutates the result
+        self.tt[h] = EvaluationResult(
+            moves=copy_move_nodes(result.moves),
+            score=result.score,
+            state=result.state,
+            info=result.info,
+            raw=result.raw
+        )
+        while len(self.tt) > self.TT_CAPACITY:
+            self.tt.popitem(last=False)
+
+    def _apply_virtual_loss(self, leaf):
+        current = leaf
+        while current:
+            current.update_stats(1)
+            current = current.parent
+
+    def _revert_virtual_loss(self, leaf):
+        current = leaf
+        while current:
+            current.update_stats(-1)
+            current = current.parent
@@ -1,14 +1,74 @@
+import typing
+import numpy as np
 import sgf_tool
 from .types import BoardState
 
 
 class SolverNode(sgf_tool.SGFNode):
+    # Keep instances __dict__-free: with thousands of nodes per solve, the
+    # per-instance dict dominates memory and every hot-path attribute read.
+    __slots__ = ('winrate', 'visit_count', 'status',
+                 'black_win_children', 'white_win_children',
+                 'turn', 'zobrist', '_job_suffix', '_move_str',
+                 '_last_ignore_hash',
+                 'child_winrate', 'child_visits', 'child_list', 'child_index')
 
     def __init__(self):
         super().__init__()
         self.winrate: float = 0.0
         self.visit_count: int = 0
         self.status: BoardState = BoardState.UNKNOWN
+        # Number of children proven as a win for each side, maintained by
+        # Tree.set_status so backpropagation never rescans the child list.
+        self.black_win_children: int = 0
+        self.white_win_children: int = 0
+        # Side that played this node's move: 1 for black, -1 for white,
+        # 0 until derived. Cached so backpropagation never repeats the
+        # "W" membership test per ancestor.
+        self.turn: int = 0
+        self.zobrist: typing.Optional[int] = None
+        self._job_suffix: typing.Optional[str] = None
+        self._move_str: typing.Optional[str] = None
+        # Hash of the ignore set used for this node's last ignore-evaluation
+        self._last_ignore_hash: typing.Optional[int] = None
+        # SoA mirror of the children's MCTS statistics, used to vectorize
+        # UCT selection. Rebuilt lazily whenever the child set changes.
+        self.child_winrate: typing.Optional[np.ndarray] = None
+        self.child_visits: typing.Optional[np.ndarray] = None
+        self.child_list: typing.Optional[typing.List["SolverNode"]] = None
+        self.child_index: int = -1
+
+    def rebuild_child_arrays(self):
+        """Rebuild the SoA view of the children from the sibling linked list."""
+        n = self.num_children
+        self.child_winrate = np.empty(n, dtype=np.float64)
+        self.child_visits = np.empty(n, dtype=np.int64)
+        self.child_list = []
+        ch = self.child
+        i = 0
+        while ch:
+            self.child_winrate[i] = ch.winrate
+            self.child_visits[i] = ch.visit_count
+            ch.child_index = i
+            self.child_list.append(ch)
+            ch = ch.next_sibling
+            i += 1
+
+    def invalidate_child_arrays(self):
+        self.child_winrate = None
+        self.child_visits = None
+        self.child_list = None
+
+    def update_stats(self, visit_delta: int, winrate_delta: float = 0.0):
+        """Update this node's statistics and keep the parent's SoA in sync."""
+        self.visit_count += visit_delta
+        self.winrate += winrate_delta
+        par = self.parent
+        if par is not None and par.child_list is not None \
+                and 0 <= self.child_index < len(par.child_list) \
+                and par.child_list[self.child_index] is self:
+            par.child_visits[self.child_index] += visit_delta
+            par.child_winrate[self.child_index] += winrate_delta
 
 
 class SolverNodeAllocator(sgf_tool.parser.NodeAllocator[SolverNode]):
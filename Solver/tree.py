@@ -1,9 +1,35 @@
 import typing
 import math
 import random
+import numpy as np
 import sgf_tool
 from .solver_node import SolverNode, SolverNodeAllocator
 from .types import BoardState, EvaluationResult
+from .utils import zobrist_hash, zobrist_node_key
+import warnings
+
+try:
+    from . import _native
+except Exception:
+    warnings.warn("Failed to import Solver._native", ImportWarning)
+    _native = None
+
+
+# 1/sqrt(v) lookup table indexed by visit_count - 1, grown on demand, so
+# the UCT exploration term is a table gather plus multiply instead of a
+# sqrt and divide per child.
+_INV_SQRT = np.reciprocal(np.sqrt(np.arange(1, (1 << 16) + 1, dtype=np.float64)))
+
+
+def _inv_sqrt_table(max_visits: int) -> np.ndarray:
+    global _INV_SQRT
+    if max_visits > len(_INV_SQRT):
+        size = len(_INV_SQRT)
+        while size < max_visits:
+            size *= 2
+        _INV_SQRT = np.reciprocal(
+            np.sqrt(np.arange(1, size + 1, dtype=np.float64)))
+    return _INV_SQRT
 
 
 class Tree:
@@ -24,11 +50,33 @@ class Tree:
             child = child.next_sibling
         return all_moves
 
+    def set_status(self, node: SolverNode, status: BoardState):
+        """Set a node's proven status and update the parent's win counters.
+
+        A node's status can flip when it is re-evaluated with a different
+        ignore set, so the counter for the old status is released before
+        the new one is taken -- the counters always reflect the children's
+        current statuses, exactly like the scan they replace.
+        """
+        if node.status == status:
+            return
+        par = node.parent
+        if par is not None:
+            if node.status == BoardState.BLACK_WIN:
+                par.black_win_children -= 1
+            elif node.status == BoardState.WHITE_WIN:
+                par.white_win_children -= 1
+            if status == BoardState.BLACK_WIN:
+                par.black_win_children += 1
+            elif status == BoardState.WHITE_WIN:
+                par.white_win_children += 1
+        node.status = status
+
     def expand(self, node: SolverNode, result: EvaluationResult):
         if result.state == BoardState.BLACK_WIN:
-            node.status = BoardState.BLACK_WIN
+            self.set_status(node, BoardState.BLACK_WIN)
         elif result.state == BoardState.WHITE_WIN:
-            node.status = BoardState.WHITE_WIN
+            self.set_status(node, BoardState.WHITE_WIN)
 
         if result.moves:
             # Collect all siblings from the result.moves
@@ -38,35 +86,45 @@ class Tree:
                 moves.append(ptr)
                 ptr = ptr.next_sibling
 
+            parent_hash = zobrist_hash(node)
             for move in moves:
                 node.add_child(move)
+                # Derive the child's position hash incrementally
+                move.zobrist = parent_hash ^ zobrist_node_key(move)
+                move.turn = -1 if "W" in move else 1
+            # The child set changed; selection rebuilds the SoA lazily
+            node.invalidate_child_arrays()
 
     def backpropagate(self, node: SolverNode, result: EvaluationResult):
         current = node
 
-        turn = 1
-        if "W" in node:
-            turn = -1
+        # A status change can only cascade upward from a newly proven child;
+        # once an ancestor stays UNKNOWN the chain is broken and the rest of
+        # the walk is a pure visit/winrate update.
+        status_propagating = True
         while current:
-            current.visit_count += 1
-            current.winrate += result.score
-            if current.child:
+            current.update_stats(1, result.score)
+            # The win counters are maintained incrementally by set_status,
+            # so no child-list scan is needed per ancestor.
+            if status_propagating and current.child:
+                # Each ancestor's side comes from its cached turn field
+                # rather than sign alternation, which misattributes plies
+                # on Connect6's consecutive same-colour moves. Nodes that
+                # predate expand (loaded from the job SGF) derive it here
+                # once.
+                turn = current.turn
+                if turn == 0:
+                    turn = -1 if "W" in current else 1
+                    current.turn = turn
                 if turn == 1:
-                    children = current.child
-                    while children:
-                        if children.status == BoardState.BLACK_WIN:
-                            current.status = BoardState.BLACK_WIN
-                            break
-                        children = children.next_sibling
+                    if current.black_win_children > 0:
+                        self.set_status(current, BoardState.BLACK_WIN)
                 else:
-                    children = current.child
-                    while children:
-                        if children.status == BoardState.WHITE_WIN:
-                            current.status = BoardState.WHITE_WIN
-                            break
-                        children = children.next_sibling
-
-            turn *= -1
+                    if current.white_win_children > 0:
+                        self.set_status(current, BoardState.WHITE_WIN)
+                if current.status == BoardState.UNKNOWN:
+                    status_propagating = False
+
             result.score = -result.score
             current = current.parent
 
@@ -80,22 +138,26 @@ class MCTS(Tree):
     def selection(self):
         xd = self.root
         while xd.num_children > 0:
-            np = xd.visit_count 
-            ch = xd.child 
-            id = 0
-            mxid = -1
-            mxval = -1e18
-            while ch:
-                if ch.visit_count == 0:
-                    nowscore = 1e18
-                else:
-                    nowscore = ch.winrate / ch.visit_count + self.c * math.sqrt(math.log(np) / ch.visit_count)
-                
-                if nowscore > mxval:
-                    mxval = nowscore
-                    mxid = id
-                ch = ch.next_sibling
-                id += 1
-            xd = xd.get_child(mxid)
-        
+            if xd.child_list is None or len(xd.child_list) != xd.num_children:
+                xd.rebuild_child_arrays()
+
+            np_ = xd.visit_count
+            # The parent-dependent part of UCT is the same for every child,
+            # so compute log(np) once and evaluate all children in one
+            # pass over the SoA arrays instead of a Python loop.
+            log_np = math.log(np_) if np_ > 0 else 0.0
+            if _native is not None:
+                mxid = _native.uct_best_child(
+                    xd.child_winrate, xd.child_visits, self.c, log_np)
+            else:
+                visits = xd.child_visits
+                safe_visits = np.maximum(visits, 1)
+                inv_sqrt = _inv_sqrt_table(
+                    int(safe_visits.max()))[safe_visits - 1]
+                scores = xd.child_winrate / safe_visits + \
+                    (self.c * math.sqrt(log_np)) * inv_sqrt
+                scores[visits == 0] = np.inf
+                mxid = int(scores.argmax())
+            xd = xd.child_list[mxid]
+
         return xd
@@ -12,7 +12,7 @@ class BoardState(enum.Enum):
     WHITE_WIN = 1
 
 
-@dataclass
+@dataclass(slots=True)
 class EvaluationResult:
     moves: "SolverNode"
     score: float
@@ -2,10 +2,96 @@ import sgf_tool
 from .solver_node import SolverNode, SolverNodeAllocator
 import subprocess
 import os
+import sys
 import asyncio
+import random
+import re
+import functools
 import typing
 
 
+# Zobrist keys for incremental position hashing: one random uint64 per
+# (board point, color) pair on a 19x19 board. The seed is fixed so hashes
+# are stable across runs.
+_ZOBRIST_BOARD_SIZE = 19
+_zobrist_rng = random.Random(0x6C6F6E67)
+ZOBRIST_KEYS = [_zobrist_rng.getrandbits(64)
+                for _ in range(_ZOBRIST_BOARD_SIZE * _ZOBRIST_BOARD_SIZE * 2)]
+
+
+def _zobrist_move_key(player: str, coords: str) -> int:
+    if len(coords) != 2:
+        return 0
+    col = ord(coords[0].upper()) - ord('A')
+    row = ord(coords[1].upper()) - ord('A')
+    if not (0 <= row < _ZOBRIST_BOARD_SIZE and 0 <= col < _ZOBRIST_BOARD_SIZE):
+        return 0
+    color = 0 if player == "B" else 1
+    return ZOBRIST_KEYS[(row * _ZOBRIST_BOARD_SIZE + col) * 2 + color]
+
+
+def zobrist_node_key(node: sgf_tool.SGFNode) -> int:
+    """Compute the XOR of the Zobrist keys for the stones placed by a single node."""
+    key = 0
+    for player in ("B", "W"):
+        if player in node:
+            for coords in node[player]:
+                key ^= _zobrist_move_key(player, coords)
+    return key
+
+
+def zobrist_hash(node: sgf_tool.SGFNode) -> int:
+    """Compute the Zobrist hash of the position reached at `node`.
+
+    The hash is cached on the node (`node.zobrist`) and derived from the
+    parent's cached hash, so a full parent walk only happens once per path.
+    """
+    cached = getattr(node, "zobrist", None)
+    if cached is not None:
+        return cached
+    parent = node.get_parent()
+    h = (zobrist_hash(parent) if parent else 0) ^ zobrist_node_key(node)
+    try:
+        node.zobrist = h
+    except AttributeError:
+        pass
+    return h
+
+
+def copy_move_nodes(node: typing.Optional[SolverNode]) -> typing.Optional[SolverNode]:
+    """Clone a chain of move nodes (properties and structure only).
+
+    parse_nctu6_output returns the engine's move sequence as a
+    parent->child chain (Connect6 double moves span two nodes), so the
+    clone recurses into each node's child chain as well as its siblings.
+    Cached evaluation results must not share nodes with the tree:
+    expand() detaches and re-parents the moves it inserts.
+    """
+    head: typing.Optional[SolverNode] = None
+    tail: typing.Optional[SolverNode] = None
+    ptr = node
+    while ptr:
+        clone = SolverNode()
+        for tag in ptr.get_tags():
+            clone[tag] = list(ptr[tag])
+        child = copy_move_nodes(ptr.child)
+        if child is not None:
+            clone.child = child
+            num_children = 0
+            while child:
+                child.parent = clone
+                num_children += 1
+                child = child.next_sibling
+            clone.num_children = num_children
+        if tail is None:
+            head = clone
+        else:
+            tail.next_sibling = clone
+        tail = clone
+        ptr = ptr.next_sibling
+    return head
+
+
 def execute_nctu6(command_args, *, executable=f"{os.path.dirname(os.path.abspath(__file__))}/../NCTU6/exec", working_dir=None):
     """Execute the NCTU6 executable with given command arguments.
 
@@ -27,13 +113,22 @@ def execute_nctu6(command_args, *, executable=f"{os.path.dirname(os.path.abspath
     command = [executable] + command_args
 
     try:
-        result = subprocess.run(
+        # Read stdout as raw bytes and decode once: NCTU6 output is ASCII,
+        # so latin-1 decodes it with a plain memcpy and no intermediate
+        # text-mode buffering.
+        # close_fds=False lets CPython launch via posix_spawn instead of
+        # fork+exec, skipping the copy-on-write page-table setup of the
+        # (large) solver heap on every evaluation.
+        process = subprocess.Popen(
             command,
             cwd=working_dir,
-            capture_output=True,
-            text=True
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            close_fds=False
         )
-        return result.stdout
+        stdout = process.stdout.read()
+        process.wait()
+        return stdout.decode('latin-1')
 
     except FileNotFoundError as e:
         raise FileNotFoundError(
@@ -62,17 +157,19 @@ async def execute_nctu6_async(command_args, *, executable=f"{os.path.dirname(os.
         working_dir = os.path.dirname(os.path.abspath(executable))
 
     try:
+        # close_fds=False for the posix_spawn fast path (see execute_nctu6)
         process = await asyncio.create_subprocess_exec(
             executable,
             *command_args,
             cwd=working_dir,
             stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
+            stderr=asyncio.subprocess.PIPE,
+            close_fds=False
         )
 
         stdout, stderr = await process.communicate()
 
-        return stdout.decode('utf-8')
+        return stdout.decode('latin-1')
 
     except FileNotFoundError as e:
         raise FileNotFoundError(
@@ -81,6 +178,19 @@ async def execute_nctu6_async(command_args, *, executable=f"{os.path.dirname(os.
         raise RuntimeError(f"An error occurred: {e}") from e
 
 
+def descend_main_line(node: sgf_tool.SGFNode, steps: int) -> sgf_tool.SGFNode:
+    """Follow the first-child chain for up to `steps` steps.
+
+    Stops early at a leaf and returns the node reached.
+    """
+    current = node
+    for _ in range(steps):
+        if current.child is None:
+            break
+        current = current.child
+    return current
+
+
 def get_player(node: sgf_tool.SGFNode) -> str:
     if "B" in node:
         return "B"
@@ -91,81 +201,111 @@ def get_player(node: sgf_tool.SGFNode) -> str:
 
 
 def node_to_move_string(node: sgf_tool.SGFNode) -> str:
+    # A node's move never changes, so cache the rendered string: it is
+    # rebuilt O(depth) times per job string and once per ignore entry.
+    cached = getattr(node, "_move_str", None)
+    if cached is not None:
+        return cached
     player = get_player(node)
     move_coords = node[player][0]
     move_str = f"{player}[{move_coords}]"
+    try:
+        node._move_str = move_str
+    except AttributeError:
+        pass
     return move_str
 
 
 def node_to_job(node: sgf_tool.SGFNode) -> str:
-    nodes = []
-    ptr = node
-    while ptr:
-        if ptr:
-            nodes.append(ptr)
-        ptr = ptr.get_parent()
-    nodes.reverse()
-    job = ";" + ";".join(node_to_move_string(n) for n in nodes)
+    # The job string is append-only along a path, so cache it per node and
+    # derive it from the parent's cached string instead of re-walking to
+    # the root on every call.
+    cached = getattr(node, "_job_suffix", None)
+    if cached is not None:
+        return cached
+    parent = node.get_parent()
+    if parent:
+        job = node_to_job(parent) + ";" + node_to_move_string(node)
+    else:
+        job = ";" + node_to_move_string(node)
+    try:
+        node._job_suffix = job
+    except AttributeError:
+        pass
     return job
 
 
+# Output format: "<result> ;B[xx];W[yy]...;C[comment];C[comment]...".
+# Compiled once so each evaluation is a single scan instead of split()
+# plus magic-index slicing, and the move parser is reused across calls.
+_NCTU6_OUTPUT_RE = re.compile(
+    r'^(\S+) ((?:;[BW]\[[A-Za-z]{2}\])+)', re.DOTALL)
+# Comment text may itself contain bracketed moves (the final comment is
+# a PV like "PV;W[HJ];W[JH];..."), so a comment only ends at a ']' that
+# is followed by the next ";C[" or the end of the output — the same
+# boundary the old "];C[" split used.
+_NCTU6_COMMENT_RE = re.compile(r';C\[(.*?)\](?=\s*;C\[|\s*$)', re.DOTALL)
+_NCTU6_MOVE_PARSER = sgf_tool.SGFParser(node_allocator=SolverNodeAllocator())
+
+
 def parse_nctu6_output(output: str) -> typing.Tuple[str, SolverNode, typing.List[str]]:
-    result, remainder = output.split(" ", 1)
-    sgf_string = remainder[:12]
-    move_nodes = sgf_tool.SGFParser(
-        node_allocator=SolverNodeAllocator()).parse(f"({sgf_string})")
-    comments = remainder[12:].split("];C[")
-    comments[0] = comments[0][3:]
-    comments[-1] = comments[-1].strip()[:-1]
+    match = _NCTU6_OUTPUT_RE.match(output)
+    if match is None:
+        raise ValueError(f"Unrecognized NCTU6 output: {output[:80]!r}")
+    result = match.group(1)
+    move_nodes = _NCTU6_MOVE_PARSER.parse(f"({match.group(2)})")
+    comments = [m.group(1)
+                for m in _NCTU6_COMMENT_RE.finditer(output, match.end(2))]
     return result, move_nodes, comments
 
 
+# Built once at import with interned keys: interning the looked-up string
+# too lets the dict resolve most probes by pointer identity instead of
+# hashing and comparing the label characters on every evaluation.
+_RESULT_WINRATE_MAPPING = {sys.intern(k): v for k, v in {
+    "B:w": 1,
+    "B:a_w": 0.9,
+    "a-b:B3": 0.7,
+    "a-b:B2": 0.5,
+    "a-b:B1": 0.3,
+    "a-b:stable": 0,
+    "a-b:unstable": 0,
+    "a-b:w1": -0.3,
+    "a-b:w2": -0.5,
+    "a-b:w3": -0.7,
+    "W:a_w": -0.9,
+    "W:w": -1
+}.items()}
+
+
 def result_to_winrate(result: str) -> float:
-    MAPPING = {
-        "B:w": 1,
-        "B:a_w": 0.9,
-        "a-b:B3": 0.7,
-        "a-b:B2": 0.5,
-        "a-b:B1": 0.3,
-        "a-b:stable": 0,
-        "a-b:unstable": 0,
-        "a-b:w1": -0.3,
-        "a-b:w2": -0.5,
-        "a-b:w3": -0.7,
-        "W:a_w": -0.9,
-        "W:w": -1
-    }
-    if result not in MAPPING:
+    winrate = _RESULT_WINRATE_MAPPING.get(sys.intern(result))
+    if winrate is None:
         raise ValueError(f"Unknown result format: {result}")
-    return MAPPING[result]
+    return winrate
 
 
-def to_board_string(node: sgf_tool.SGFNode, board_size: int = 19) -> str:
-    class TextType:
-        NORMAL = 0
-        BOLD = 1
-        UNDERLINE = 4
-        SIZE = 3
-
-    class TextColor:
-        BLACK = 0
-        RED = 1
-        GREEN = 2
-        YELLOW = 3
-        BLUE = 4
-        PURPLE = 5
-        CYAN = 6
-        WHITE = 7
-        SIZE = 8
-
-    def get_color_text(text: str, text_type: int, text_color: int, text_background: int) -> str:
-        text_type_number = {
-            TextType.NORMAL: 0,
-            TextType.BOLD: 1,
-            TextType.UNDERLINE: 4
-        }
-        return f"\033[{text_type_number.get(text_type, 0)};3{text_color};4{text_background}m{text}\033[0m"
+# Precomputed ANSI fragments for to_board_string. Foreground 30/37 is
+# black/white, 31 is the red move marker, background 43 is the board
+# yellow; marker style 1 is bold (last move), 0 is normal (second last).
+_BOARD_LABEL = "\033[1;30;43m%s\033[0m"
+_BOARD_CELLS = {}
+for _stone, _fg, _symbol in (("B", 0, "O"), ("W", 7, "O"), (None, 0, ".")):
+    _BOARD_CELLS[(_stone, 0)] = f"\033[1;3{_fg};43m {_symbol}\033[0m"
+    _BOARD_CELLS[(_stone, 1)] = f"\033[1;31;43m>\033[0m\033[1;3{_fg};43m{_symbol}\033[0m"
+    _BOARD_CELLS[(_stone, 2)] = f"\033[0;31;43m>\033[0m\033[1;3{_fg};43m{_symbol}\033[0m"
+
+
+@functools.lru_cache(maxsize=None)
+def _board_coordinate_line(board_size: int) -> str:
+    s = "  "
+    for i in range(board_size):
+        s += " " + chr(ord('A') + i)
+    s += "   "
+    return _BOARD_LABEL % s
 
+
+def to_board_string(node: sgf_tool.SGFNode, board_size: int = 19) -> str:
     # replay moves
     nodes = []
     ptr = node
@@ -174,11 +314,11 @@ def to_board_string(node: sgf_tool.SGFNode, board_size: int = 19) -> str:
         ptr = ptr.get_parent()
     nodes.reverse()
 
-    grid = {}  # (row, col) -> TextColor (BLACK or WHITE)
+    grid = {}  # (row, col) -> "B" or "W"
     all_moves = []  # list of (row, col)
 
     for n in nodes:
-        for color_key, color_enum in [("B", TextColor.BLACK), ("W", TextColor.WHITE)]:
+        for color_key in ("B", "W"):
             if color_key in n:
                 for coords in n[color_key]:
                     if len(coords) != 2:
@@ -190,26 +330,13 @@ def to_board_string(node: sgf_tool.SGFNode, board_size: int = 19) -> str:
                     r = board_size - 1 - r_sgf
 
                     if 0 <= r < board_size and 0 <= c < board_size:
-                        grid[(r, c)] = color_enum
+                        grid[(r, c)] = color_key
                         all_moves.append((r, c))
 
     last_move = all_moves[-1] if len(all_moves) >= 1 else None
     last2_move = all_moves[-2] if len(all_moves) >= 2 else None
 
-    lines = []
-
-    # coordinate string helper
-    def get_coordinate_string():
-        s = "  "
-        for i in range(board_size):
-            c_val = ord('A') + i
-            # if c_val >= ord('I'):
-            #     c_val += 1
-            s += " " + chr(c_val)
-        s += "   "
-        return get_color_text(s, TextType.BOLD, TextColor.BLACK, TextColor.YELLOW)
-
-    lines.append(get_coordinate_string())
+    lines = [_board_coordinate_line(board_size)]
 
     for row in range(board_size):
         # row label
@@ -217,57 +344,26 @@ def to_board_string(node: sgf_tool.SGFNode, board_size: int = 19) -> str:
         if row + 1 < 10:
             label = " " + label
 
-        line_parts = []
-        line_parts.append(get_color_text(
-            label, TextType.BOLD, TextColor.BLACK, TextColor.YELLOW))
+        line_parts = [_BOARD_LABEL % label]
 
         for col in range(board_size):
             pos = (row, col)
-            stone_color = grid.get(pos)
-
-            # determine symbol and color
-            if stone_color == TextColor.BLACK:
-                symbol = "O"
-                color = TextColor.BLACK
-            elif stone_color == TextColor.WHITE:
-                symbol = "O"
-                color = TextColor.WHITE
-            else:
-                symbol = "."
-                color = TextColor.BLACK
-
-            # determine prefix (marker or space)
             if pos == last_move:
-                prefix = ">"
-                prefix_type = TextType.BOLD
-                prefix_color = TextColor.RED
+                marker = 1
             elif pos == last2_move:
-                prefix = ">"
-                prefix_type = TextType.NORMAL
-                prefix_color = TextColor.RED
-            else:
-                prefix = " "
-                prefix_type = TextType.BOLD
-                prefix_color = color
-
-            if pos == last_move or pos == last2_move:
-                line_parts.append(get_color_text(
-                    prefix, prefix_type, prefix_color, TextColor.YELLOW))
-                line_parts.append(get_color_text(
-                    symbol, TextType.BOLD, color, TextColor.YELLOW))
+                marker = 2
             else:
-                line_parts.append(get_color_text(
-                    prefix + symbol, TextType.BOLD, color, TextColor.YELLOW))
+                marker = 0
+            line_parts.append(_BOARD_CELLS[(grid.get(pos), marker)])
 
         # right side label
         label_right = " " + str(row + 1)
         if row + 1 < 10:
             label_right += " "
-        line_parts.append(get_color_text(
-            label_right, TextType.BOLD, TextColor.BLACK, TextColor.YELLOW))
+        line_parts.append(_BOARD_LABEL % label_right)
 
         lines.append("".join(line_parts))
 
-    lines.append(get_coordinate_string())
+    lines.append(_board_coordinate_line(board_size))
 
     return "\n".join(lines)
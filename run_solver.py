@@ -4,11 +4,13 @@ import os
 # Ensure we can import from local directories
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from Solver.solver import Solver
-from Solver.types import BoardState
-from Solver.utils import node_to_move_string, to_board_string
-
 def main():
+    # Imported lazily so the solver chain (and the JIT-compiled C++
+    # backends it pulls in) only loads when the CLI actually runs
+    from Solver.solver import Solver
+    from Solver.types import BoardState
+    from Solver.utils import node_to_move_string, to_board_string, descend_main_line
+
     # Example SGF: 
     # Black places one stone at JJ.
     # White places two stones at IH, HI.
@@ -43,34 +45,30 @@ def main():
     input_moves_count = input_sgf.count(";")
     print(f"\nTraversing {input_moves_count} steps to reach the end of input sequence...")
     
-    current = root
     # Follow the main line (first child) which corresponds to the initial SGF sequence
-    for i in range(input_moves_count):
-        if current.num_children > 0:
-            current = current.get_child(0)
-        else:
-            print(f"Stopped early at depth {i}")
-            break
-            
+    current = descend_main_line(root, input_moves_count)
+
     print(f"Current Board State (at leaf):")
     # print(to_board_string(current)) # Optional: print board at leaf
 
     print("\nCandidate Moves (Children of Leaf):")
-    child = root.get_child(0)
     best_child = None
     max_visits = -1
 
-    while child:
+    for child in root.get_children():
         move_str = node_to_move_string(child)
         avg_score = child.winrate / child.visit_count if child.visit_count > 0 else 0
-        
+
         print(f"Move: {move_str:<10} | Visits: {child.visit_count:<5} | Score: {avg_score:>.2f} | Status: {child.status}")
-        
-        if child.visit_count > max_visits:
-            max_visits = child.visit_count
-            best_child = child
-            
-        child = child.next_sibling
+
+    # Pick the most-visited child with one vectorized argmax over the
+    # node's SoA visit mirror instead of a Python max-tracking loop
+    if root.num_children > 0:
+        if root.child_list is None or len(root.child_list) != root.num_children:
+            root.rebuild_child_arrays()
+        best_idx = int(root.child_visits.argmax())
+        best_child = root.child_list[best_idx]
+        max_visits = int(root.child_visits[best_idx])
 
     if best_child:
         print("\n" + "=" * 40)
@@ -5,6 +5,7 @@ symbols as Python callables with convenient type conversions.
 
 from __future__ import annotations
 
+import functools
 import getpass
 import hashlib
 import os
@@ -20,11 +21,68 @@ import ctypes  # pylint: disable=wrong-import-position
 
 from ._types import void  # type: ignore
 
-__all__ = ["DynamicLibrary", "CompileError", "FunctionWrapper"]
+__all__ = ["DynamicLibrary", "CompileError", "FunctionWrapper", "LIB_EXT"]
 
 _SYSTEM = platform.system()
 _IS_WINDOWS = _SYSTEM == "Windows"
 _LIB_EXT = {"Windows": ".dll", "Darwin": ".dylib"}.get(_SYSTEM, ".so")
+# Public alias so callers can locate prebuilt artefacts for this platform
+LIB_EXT = _LIB_EXT
+
+# Cache keying only needs a stable collision-resistant digest, not a
+# cryptographic one: prefer BLAKE3 (SIMD, several GB/s) when available
+# and fall back to hashlib's SHA-256. Runs on every compile_string call,
+# cache hit or not, so it is part of import latency.
+# libc's dlclose, resolved once at import: grabbing it per instance
+# costs a dlopen/dlsym pair for every DynamicLibrary construction.
+if not _IS_WINDOWS:
+    _DLCLOSE = ctypes.CDLL(None).dlclose  # type: ignore[attr-defined]
+    _DLCLOSE.argtypes = [ctypes.c_void_p]
+
+
+# Advisory file locking so concurrent processes with a cold cache build
+# a given library once: the first takes the lock and compiles, the rest
+# block on it and then load the finished artefact.
+if _IS_WINDOWS:
+    import msvcrt
+
+    def _lock_file(fp) -> None:
+        msvcrt.locking(fp.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(fp) -> None:
+        msvcrt.locking(fp.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock_file(fp) -> None:
+        fcntl.flock(fp.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(fp) -> None:
+        fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+
+
+try:
+    from blake3 import blake3 as _blake3  # type: ignore
+
+    def _cache_digest(payload: bytes) -> str:
+        return _blake3(payload).hexdigest()
+except ImportError:
+    def _cache_digest(payload: bytes) -> str:
+        return hashlib.sha256(payload).hexdigest()
+
+
+@functools.lru_cache(maxsize=32)
+def _source_digest(source: str, cmd: Tuple[str, ...], flags: Tuple[str, ...]) -> str:
+    """Memoized cache-key digest for a (source, compiler, flags) triple.
+
+    Module sources are literals compiled repeatedly with identical flags
+    (e.g. clexer on every import in one process), so after the first call
+    the key lookup is O(1): CPython caches the string's hash, and the
+    full digest is only computed on an lru miss. Keyed by value rather
+    than id() so a recycled object id can never alias a stale digest.
+    """
+    return _cache_digest(
+        (source + "|cmd=" + " ".join(cmd) + " ".join(flags)).encode())
 
 
 class CompileError(RuntimeError):
@@ -43,6 +101,10 @@ class CompileError(RuntimeError):
         self.stderr = stderr
 
 
+def _identity(arg):
+    return arg
+
+
 class FunctionWrapper:
     """
     Thin callable that wraps a *ctypes* function pointer and applies the
@@ -55,6 +117,9 @@ class FunctionWrapper:
     3
     """
 
+    __slots__ = ('__name__', '__qualname__', '_arg_conv', '_nargs',
+                 '_cfunc', '_invoke', 'address')
+
     def __init__(
         self,
         name: str,
@@ -64,19 +129,47 @@ class FunctionWrapper:
     ):
         self.__name__ = name
         self.__qualname__ = name
-        self._arg_conv = arg_converters
+        # A tuple iterates on the fast path regardless of what sequence
+        # type the caller handed in, and the arity is cached for the
+        # specialization branches below.
+        self._arg_conv = tuple(arg_converters)
+        self._nargs = len(self._arg_conv)
         self._cfunc = cfunc
         self.address: Optional[int] = None  # filled later
         self._cfunc.restype = restype.type_mapping if restype else None
         if arg_converters:
             self._cfunc.argtypes = [a.type_mapping for a in arg_converters]
+        self._invoke = self._make_invoke()
+
+    def _make_invoke(self):
+        """Build a specialized call path for this function's arity.
+
+        These wrappers sit on per-token hot loops, so the generic
+        zip-over-converters generator is replaced at bind time with an
+        unrolled closure (or the bare ctypes function when no conversion
+        is needed at all).
+        """
+        cfunc = self._cfunc
+        if not self._arg_conv or all(c is None for c in self._arg_conv):
+            return cfunc
+        convs = tuple(c if c is not None else _identity
+                      for c in self._arg_conv)
+        if self._nargs == 1:
+            c0, = convs
+            return lambda a0: cfunc(c0(a0))
+        if self._nargs == 2:
+            c0, c1 = convs
+            return lambda a0, a1: cfunc(c0(a0), c1(a1))
+        if self._nargs == 3:
+            c0, c1, c2 = convs
+            return lambda a0, a1, a2: cfunc(c0(a0), c1(a1), c2(a2))
+        if self._nargs == 4:
+            c0, c1, c2, c3 = convs
+            return lambda a0, a1, a2, a3: cfunc(c0(a0), c1(a1), c2(a2), c3(a3))
+        return lambda *args: cfunc(*[c(a) for c, a in zip(convs, args)])
 
     def __call__(self, *args):
-        converted = (
-            conv(arg) if conv is not None else arg
-            for conv, arg in zip(self._arg_conv, args)
-        )
-        return self._cfunc(*converted)
+        return self._invoke(*args)
 
     def __repr__(self) -> str:  # noqa: D401
         arg_sig = (
@@ -102,6 +195,10 @@ class DynamicLibrary:
     cache_dir : str | Path | None
         Directory used to store compiled artefacts keyed by SHA-256 of
         (source + flags).  If `None`, uses platform temp dir.
+    release : bool, default True
+        Build with host-tuned optimization flags (`-march=native`,
+        LTO, hidden visibility, `-DNDEBUG`).  Set to `False` for a
+        debug-friendly `-O3 -g` build.
 
     Examples
     --------
@@ -121,9 +218,11 @@ class DynamicLibrary:
         *,
         cache_dir: str | os.PathLike | None = None,
         extra_compile_flags: Optional[Sequence[str]] = None,
+        release: bool = True,
     ) -> None:
         self._compiler_cmd: Tuple[str, ...] = self._resolve_compiler(cc)
         self._extra_flags = tuple(extra_compile_flags or ())
+        self._release = release
         if cache_dir is None:
             self._cache_dir = Path(tempfile.gettempdir()) / \
                 f"dynlib_cache_{getpass.getuser()}"
@@ -136,11 +235,9 @@ class DynamicLibrary:
         self._lib_handle: Optional["ctypes.CDLL"] = None
         self._exported: List[str] = []
 
-        # For POSIX `dlclose`
+        # For POSIX `dlclose` (shared module-level handle)
         if not _IS_WINDOWS:
-            self._dlclose = ctypes.cdll.LoadLibrary(
-                "").dlclose  # type: ignore[attr-defined]
-            self._dlclose.argtypes = [ctypes.c_void_p]
+            self._dlclose = _DLCLOSE
 
     # ---------------- context-manager ---------------- #
     def __enter__(self) -> "DynamicLibrary":
@@ -182,16 +279,32 @@ class DynamicLibrary:
                 #ifdef _WIN32
                 #   define API extern "C" __declspec(dllexport)
                 #else
-                #   define API extern "C"
+                #   define API extern "C" __attribute__((visibility("default")))
                 #endif
                 """
             )
         )
-        exports = list((functions or {}).keys())
-        full_source = prefix + "\n" + source + \
-            "\n" + _create_extractors(exports)
+        full_source = prefix + "\n" + source
         self._build_and_load(full_source, functions or {})
 
+    def load_prebuilt(
+        self,
+        filepath: str | os.PathLike,
+        *,
+        functions: Dict[str, Dict] | None = None,
+    ) -> None:
+        """
+        Load an already compiled shared library and bind its symbols.
+
+        Skips hashing, source generation and the compiler entirely, so
+        modules that ship a prebuilt artefact start in milliseconds and
+        need no compiler on the host.  The file must export the same
+        symbols `compile_string` would have produced.
+        """
+        path = Path(filepath).expanduser().resolve()
+        self._lib_handle = ctypes.CDLL(str(path))
+        self._bind_functions(functions or {})
+
     def compile_file(
         self,
         filepath: str | os.PathLike,
@@ -237,29 +350,51 @@ class DynamicLibrary:
     def _build_and_load(
         self, source: str, functions: Dict[str, Dict[str, object]]
     ) -> None:
-        # 1) check cache
-        digest = hashlib.sha256(
-            (
-                source
-                + "|cmd="  # ensure different flag sets map differently
-                + " ".join(self._compiler_cmd)
-                + " ".join(self._extra_flags)
-            ).encode()
-        ).hexdigest()
+        # 1) check cache (cmd/flags keep different flag sets distinct,
+        #    including the release/debug mode flags)
+        digest = _source_digest(
+            source, self._compiler_cmd, self._mode_flags() + self._extra_flags)
         cached_lib = self._cache_dir / f"lib_{digest}{_LIB_EXT}"
         if not cached_lib.exists():
-            # 2) Compile into temp dir
-            self._tmp_dir_ctx = tempfile.TemporaryDirectory()
-            self._tmp_dir_path = Path(self._tmp_dir_ctx.name)
-            src_path = self._tmp_dir_path / "lib.cpp"
-            src_path.write_text(source, encoding="utf-8")
-
-            self._compile(src_path, cached_lib)
+            # 2) Compile into temp dir, publishing atomically under a
+            #    file lock so concurrent cold-cache processes build once
+            lock_path = cached_lib.with_suffix(".lock")
+            with open(lock_path, "w") as lock_fp:
+                _lock_file(lock_fp)
+                try:
+                    # another process may have built it while we waited
+                    if not cached_lib.exists():
+                        self._tmp_dir_ctx = tempfile.TemporaryDirectory()
+                        self._tmp_dir_path = Path(self._tmp_dir_ctx.name)
+                        src_path = self._tmp_dir_path / "lib.cpp"
+                        src_path.write_text(source, encoding="utf-8")
+
+                        built_lib = self._tmp_dir_path / f"lib{_LIB_EXT}"
+                        self._compile(src_path, built_lib)
+                        # os.replace is atomic, so a reader that sees the
+                        # cache file always sees a complete library
+                        os.replace(built_lib, cached_lib)
+                finally:
+                    _unlock_file(lock_fp)
         # 3) Load
         self._lib_handle = ctypes.CDLL(str(cached_lib))
         self._bind_functions(functions)
 
     # ---------- compiler invocation ---------- #
+    def _mode_flags(self) -> Tuple[str, ...]:
+        """Optimization flags for the current build mode.
+
+        Release builds tune for the host (`-march=native`), enable LTO
+        and hide non-exported symbols; the `API` macro marks exported
+        functions with default visibility so `dlsym` still finds them.
+        """
+        if _IS_WINDOWS and "cl.exe" in self._compiler_cmd[0].lower():
+            return ("/O2", "/GL", "/arch:AVX2") if self._release else ("/Od",)
+        if self._release:
+            return ("-O3", "-march=native", "-flto", "-fno-plt",
+                    "-fvisibility=hidden", "-DNDEBUG", "-g1")
+        return ("-O3", "-g")
+
     def _compile(self, src_path: Path, output_path: Path) -> None:
         cmd = list(self._compiler_cmd)
 
@@ -267,29 +402,32 @@ class DynamicLibrary:
         if _IS_WINDOWS and shutil.which("cl.exe") and "cl.exe" in cmd[0].lower():
             # cl: /LD -> DLL, /Fe:<out>
             cmd += ["/LD", str(src_path), f"/Fe:{output_path}"]
+            cmd.extend(self._mode_flags())
         else:
             # GCC/Clang
-            cmd += [str(src_path), "-shared", "-o",
-                    str(output_path), "-O3", "-g"]
+            cmd += [str(src_path), "-shared", "-o", str(output_path)]
+            cmd.extend(self._mode_flags())
             if not _IS_WINDOWS:
                 cmd.append("-fPIC")
             cmd.extend(self._extra_flags)
 
-        try:
-            result = subprocess.run(
-                cmd,
-                check=True,
-                capture_output=True,
-                text=False,
-            )
-        except subprocess.CalledProcessError as exc:  # noqa: PERF203
-            raise CompileError(exc.cmd, exc.stdout, exc.stderr) from None
-
-        # Optionally keep compile output for debugging:
-        if result.stdout or result.stderr:
-            (output_path.parent / "compile.log").write_bytes(
-                result.stdout + b"\n" + result.stderr
-            )
+        # Stream compiler output straight to the log file instead of
+        # buffering it in memory first; template-heavy compiles can emit
+        # megabytes of diagnostics. The log lives in the cache dir since
+        # the build runs in a throwaway temp dir.
+        log_path = self._cache_dir / "compile.log"
+        with open(log_path, "wb") as log_fp:
+            try:
+                subprocess.run(
+                    cmd,
+                    check=True,
+                    stdout=log_fp,
+                    stderr=subprocess.STDOUT,
+                )
+            except subprocess.CalledProcessError as exc:  # noqa: PERF203
+                log_fp.flush()
+                raise CompileError(
+                    exc.cmd, b"", log_path.read_bytes()) from None
 
     # ---------- symbol binding ---------- #
     def _bind_functions(self, functions: Dict[str, Dict[str, object]]) -> None:
@@ -303,12 +441,8 @@ class DynamicLibrary:
             setattr(self, name, wrapper)
             self._exported.append(name)
 
-            # Get raw address via extractor and store to wrapper.address
-            extractor_name = f"__get_library_function_pointer_{name}"
-            extractor = getattr(self._lib_handle, extractor_name, None)
-            if extractor is not None:
-                extractor.restype = ctypes.c_void_p
-                wrapper.address = extractor()
+            # ctypes already holds the symbol's address
+            wrapper.address = ctypes.cast(cfunc, ctypes.c_void_p).value
 
     # ---------- compiler discovery ---------- #
     @staticmethod
@@ -326,27 +460,3 @@ class DynamicLibrary:
             if shutil.which(cand[0]):
                 return cand
         raise FileNotFoundError("No suitable C/C++ compiler found on PATH.")
-
-
-# Helper – generate extractor functions                                    #
-_EXTRACTOR_FMT = (
-    r"void* __get_library_function_pointer_{0}() {{ "
-    r"return reinterpret_cast<void*>({0}); }}"
-)
-_EXTRACTOR_WIN = 'extern "C" __declspec(dllexport) '
-_EXTRACTOR_POSIX = 'extern "C" '
-
-
-def _create_extractors(funcs: Iterable[str]) -> str:
-    win = "\n".join(_EXTRACTOR_WIN + _EXTRACTOR_FMT.format(f) for f in funcs)
-    posix = "\n".join(_EXTRACTOR_POSIX + _EXTRACTOR_FMT.format(f)
-                      for f in funcs)
-    return textwrap.dedent(
-        f"""
-        #ifdef _WIN32
-        {win}
-        #else
-        {posix}
-        #endif
-        """
-    )
@@ -25,4 +25,4 @@ from ._types import double
 from ._types import void
 from ._types import void_p
 
-from ._DynamicLibrary import DynamicLibrary
+from ._DynamicLibrary import DynamicLibrary, LIB_EXT
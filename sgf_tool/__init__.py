@@ -6,8 +6,21 @@ from . import utils
 from . import games
 import warnings
 
-try:
-    from . import cparser
-except ImportError:
-    warnings.warn("Failed to import cparser", ImportWarning)
-    cparser = None
+def __getattr__(name):
+    # PEP 562 lazy load: importing cparser JIT-compiles its C++ backend,
+    # which dominates package import time for callers that never touch
+    # it, so defer the import to first attribute access. A successful
+    # import binds the submodule on the package, caching it; a failed
+    # one caches None (matching the old eager-import fallback).
+    # (importlib rather than `from . import`, which would re-enter this
+    # __getattr__ while resolving the submodule and recurse.)
+    if name == 'cparser':
+        import importlib
+        try:
+            module = importlib.import_module('.cparser', __name__)
+        except ImportError:
+            warnings.warn("Failed to import cparser", ImportWarning)
+            module = None
+        globals()['cparser'] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,7 @@
+import ctypes
 import enum
 import typing
+import numpy as np
 from . import DynamicLibrary as dl
 import os
 
@@ -16,6 +18,8 @@ class SGFTokenType(enum.Enum):
 
 
 class SGFToken:
+    __slots__ = ('type', 'value', 'start', 'end')
+
     def __init__(self, type: SGFTokenType, value: str, start: int, end: int):
         self.type = type
         self.value = value
@@ -23,96 +27,255 @@ class SGFToken:
         self.end = end
 
 
+# Mirrors the C++ `struct TokenOut` below: one next_token call fills the
+# whole record, so the per-token Python->C boundary cost is a single FFI
+# transition plus one value fetch instead of six separate accessor calls.
+class _TokenOut(ctypes.Structure):
+    _fields_ = [
+        ('type', ctypes.c_int32),
+        ('start', ctypes.c_int32),
+        ('end', ctypes.c_int32),
+        ('len', ctypes.c_uint64),
+        ('data', ctypes.c_void_p),
+        ('is_ascii', ctypes.c_uint8),
+    ]
+
+
+# Mirrors the C++ `struct TokenRecord`: lex_all fills a contiguous array
+# of these in one call. Values are byte-for-byte substrings of the input
+# (escape backslashes are preserved by the lexer), so a record only needs
+# an offset/length into the caller's SGF bytes — no value arena.
+class _TokenRecord(ctypes.Structure):
+    _fields_ = [
+        ('type', ctypes.c_int32),
+        ('start', ctypes.c_int32),
+        ('end', ctypes.c_int32),
+        ('value_off', ctypes.c_uint32),
+        ('value_len', ctypes.c_uint32),
+    ]
+
+
+# NumPy view of the same record layout, for the SoA token-stream API
+_TOKEN_RECORD_DTYPE = np.dtype([
+    ('type', np.int32),
+    ('start', np.int32),
+    ('end', np.int32),
+    ('value_off', np.uint32),
+    ('value_len', np.uint32),
+])
+
+
 # C++ implementation of SGFLexer
 base_dir = os.path.dirname(os.path.abspath(__file__))
-lib = dl.DynamicLibrary(extra_compile_flags=['-I' + base_dir])
-lib.compile_string(
-    r'''
+
+_LEXER_SOURCE = r'''
 #include "lexer.hpp"
-#include <iostream>
+#include <cstdint>
 #include <cstring>
+#include <vector>
 
-API SGFToken* create_token() {
-    return new SGFToken(SGFTokenType::NONE, "", 0, 0);
-}
+// Per-thread free list of lexers: acquire pops and resets, release
+// pushes back, so parsing many SGFs reuses the same allocations instead
+// of paying new/delete per parse. thread_local keeps it lock-free.
+static thread_local std::vector<SGFLexer*> lexer_pool;
+
+struct TokenOut {
+    int32_t type;
+    int32_t start;
+    int32_t end;
+    uint64_t len;
+    const char* data;
+    uint8_t is_ascii;
+};
 
-API void delete_token(SGFToken* token) {
-    delete token;
+// Branchless ASCII check: OR eight bytes at a time and test the high
+// bits once, so Python can pick the memcpy-like ascii codec over the
+// per-byte UTF-8 decoder.
+static uint8_t ascii_only(const char* p, size_t n) {
+    uint64_t acc = 0;
+    size_t i = 0;
+    for (; i + 8 <= n; i += 8) {
+        uint64_t word;
+        memcpy(&word, p + i, 8);
+        acc |= word;
+    }
+    for (; i < n; ++i) {
+        acc |= static_cast<unsigned char>(p[i]);
+    }
+    return (acc & 0x8080808080808080ULL) == 0;
 }
 
-API SGFLexer* create_lexer(const char* sgf, int start, void (*progress_callback)(int, int)) {
+API SGFLexer* acquire_lexer(const char* sgf, int start, void (*progress_callback)(int, int)) {
+    if (!lexer_pool.empty()) {
+        SGFLexer* lexer = lexer_pool.back();
+        lexer_pool.pop_back();
+        lexer->reset(sgf, start, progress_callback);
+        return lexer;
+    }
     return new SGFLexer(sgf, start, progress_callback);
 }
 
-API void delete_lexer(SGFLexer* lexer) {
-    delete lexer;
+API void release_lexer(SGFLexer* lexer) {
+    lexer_pool.push_back(lexer);
 }
 
-API void next_token(SGFLexer* lexer, SGFToken* token) {
+API void next_token(SGFLexer* lexer, TokenOut* out) {
+    // The lexer keeps the returned token alive until the next call, so
+    // handing out a pointer into its value buffer is safe: Python copies
+    // it out (ctypes.string_at) before asking for another token.
     auto& t = lexer->next_token();
-    token->type = t.type;
-    token->value = t.value;
-    token->start = t.start;
-    token->end = t.end;
-}
-
-API int get_token_type(SGFToken* token) {
-    return static_cast<int>(token->type);
-}
-
-API size_t get_token_value_length(SGFToken* token) {
-    return token->value.length();
+    out->type = static_cast<int32_t>(t.type);
+    out->start = static_cast<int32_t>(t.start);
+    out->end = static_cast<int32_t>(t.end);
+    out->len = t.value.length();
+    out->data = t.value.data();
+    out->is_ascii = ascii_only(t.value.data(), t.value.length());
 }
 
-API void get_token_value(SGFToken* token, char* buffer) {
-    strcpy(buffer, token->value.c_str());
-}
+struct TokenRecord {
+    int32_t type;
+    int32_t start;
+    int32_t end;
+    uint32_t value_off;
+    uint32_t value_len;
+};
 
-API int get_token_start(SGFToken* token) {
-    return token->start;
+// Lex the whole input in one call, writing up to `cap` records. Returns
+// the total token count (including the terminating END token); if it
+// exceeds cap the caller re-invokes with a large enough array.
+API int64_t lex_all(const char* sgf, int start, TokenRecord* out, int64_t cap) {
+    SGFLexer lexer(sgf, start, nullptr);
+    int64_t n = 0;
+    while (true) {
+        auto& t = lexer.next_token();
+        if (n < cap) {
+            out[n].type = static_cast<int32_t>(t.type);
+            out[n].start = static_cast<int32_t>(t.start);
+            out[n].end = static_cast<int32_t>(t.end);
+            out[n].value_off = static_cast<uint32_t>(t.start);
+            out[n].value_len = static_cast<uint32_t>(t.value.length());
+        }
+        ++n;
+        if (t.type == SGFTokenType::ENDOFFILE) {
+            break;
+        }
+    }
+    return n;
 }
+'''
 
-API int get_token_end(SGFToken* token) {
-    return token->end;
+# All of these are bound through ctypes.CDLL, which drops the GIL for
+# the duration of each C call, so threads lexing different SGFs really
+# run in parallel (the C++ lexer pool is thread_local and shares no
+# state). This only holds while the progress callback stays NULL -- the
+# Python wrapper passes 0 -- since invoking a Python callback from C
+# would re-acquire the GIL per call. Verified by observing a Python
+# thread making progress while another thread sat inside lex_all.
+_LEXER_FUNCTIONS = {
+    'acquire_lexer': {'argtypes': [dl.char_p, dl.int32, dl.void_p], 'restype': dl.void_p},
+    'release_lexer': {'argtypes': [dl.void_p], 'restype': dl.void},
+    'next_token': {'argtypes': [dl.void_p, dl.void_p], 'restype': dl.void},
+    'lex_all': {'argtypes': [dl.char_p, dl.int32, dl.void_p, dl.int64], 'restype': dl.int64},
 }
 
-API void print_token(SGFToken* token) {
-    std::cout << static_cast<int>(token->type) << " " << token->value << " " << token->start << " " << token->end << std::endl;
-}
-''', functions={
-        'create_token': {'argtypes': [], 'restype': dl.void_p},
-        'delete_token': {'argtypes': [dl.void_p], 'restype': dl.void},
-        'create_lexer': {'argtypes': [dl.char_p, dl.int32, dl.void_p], 'restype': dl.void_p},
-        'delete_lexer': {'argtypes': [dl.void_p], 'restype': dl.void},
-        'next_token': {'argtypes': [dl.void_p, dl.void_p], 'restype': dl.void},
-        'get_token_type': {'argtypes': [dl.void_p], 'restype': dl.int32},
-        'get_token_value_length': {'argtypes': [dl.void_p], 'restype': dl.uint64},
-        'get_token_value': {'argtypes': [dl.void_p, dl.int8_p], 'restype': dl.void},
-        'get_token_start': {'argtypes': [dl.void_p], 'restype': dl.int32},
-        'get_token_end': {'argtypes': [dl.void_p], 'restype': dl.int32},
-        'print_token': {'argtypes': [dl.void_p], 'restype': dl.void},
-    })
+lib = dl.DynamicLibrary(extra_compile_flags=['-I' + base_dir])
+# A prebuilt library shipped next to this file (e.g. from a wheel build)
+# skips the JIT compile and the host compiler requirement entirely.
+_prebuilt_lib = os.path.join(base_dir, 'lexer' + dl.LIB_EXT)
+if os.path.exists(_prebuilt_lib):
+    lib.load_prebuilt(_prebuilt_lib, functions=_LEXER_FUNCTIONS)
+else:
+    lib.compile_string(_LEXER_SOURCE, functions=_LEXER_FUNCTIONS)
 
 
 class SGFLexer:
-    def __init__(self, sgf: str, start: int = 0, progress_callback: typing.Optional[typing.Callable[[int, int], None]] = None):
-        self.length = len(sgf)
-        self.token = lib.create_token()
-        self.lexer = lib.create_lexer(sgf.encode(), start, 0)
+    def __init__(self, sgf: typing.Union[str, bytes], start: int = 0, progress_callback: typing.Optional[typing.Callable[[int, int], None]] = None):
+        # Encode once and keep the bytes alive on self: callers that
+        # already hold raw bytes (e.g. file readers) skip the UTF-8
+        # encode entirely, and the pinned reference makes the buffer
+        # passed to C an explicit GC root rather than a temporary.
+        self._sgf_bytes = sgf.encode() if isinstance(sgf, str) else bytes(sgf)
+        self.length = len(self._sgf_bytes)
+        self._start = start
+        self.lexer = lib.acquire_lexer(self._sgf_bytes, start, 0)
+        # One reusable output record per lexer; next_token overwrites it
+        self._out = _TokenOut()
+        self._out_addr = ctypes.addressof(self._out)
+        # Ring of reusable SGFToken objects rotated by next_token, so the
+        # steady-state lex loop allocates no Python objects per token.
+        self._ring = [SGFToken(SGFTokenType.NONE, '', 0, 0)
+                      for _ in range(8)]
+        self._ring_i = 0
         self.progress_callback = progress_callback
 
     def __del__(self):
-        lib.delete_token(self.token)
-        lib.delete_lexer(self.lexer)
+        lib.release_lexer(self.lexer)
 
     def next_token(self):
-        lib.next_token(self.lexer, self.token)
-        token_type = lib.get_token_type(self.token)
-        value_length = lib.get_token_value_length(self.token)
-        value = bytearray(value_length)
-        lib.get_token_value(self.token, value)
-        start = lib.get_token_start(self.token)
-        end = lib.get_token_end(self.token)
+        """Return the next token.
+
+        The returned SGFToken comes from a ring of 8 pooled instances
+        and is overwritten after 8 further next_token calls; consumers
+        needing more lookahead (or the whole stream) must copy the
+        fields out or use lex_all, which returns fresh objects.
+        """
+        lib.next_token(self.lexer, self._out_addr)
+        out = self._out
+        # Copy straight out of the lexer-owned value buffer; no C-side
+        # strcpy and no intermediate bytearray.
+        value = ctypes.string_at(out.data, out.len) if out.len else b''
         if self.progress_callback:
-            self.progress_callback(end, self.length)
-        return SGFToken(SGFTokenType(token_type), value.decode(), start, end)
+            self.progress_callback(out.end, self.length)
+        token = self._ring[self._ring_i]
+        self._ring_i = (self._ring_i + 1) & 7
+        token.type = SGFTokenType(out.type)
+        token.value = value.decode('ascii' if out.is_ascii else 'utf-8')
+        token.start = out.start
+        token.end = out.end
+        return token
+
+    def _lex_records(self):
+        """Fill a TokenRecord array for the whole input via one C call."""
+        data = self._sgf_bytes
+        cap = len(data) // 2 + 16
+        records = (_TokenRecord * cap)()
+        n = lib.lex_all(data, self._start, ctypes.addressof(records), cap)
+        if n > cap:
+            cap = n
+            records = (_TokenRecord * cap)()
+            n = lib.lex_all(data, self._start, ctypes.addressof(records), cap)
+        return records, n
+
+    def lex_all(self) -> typing.List[SGFToken]:
+        """Lex the entire input in one C call and return every token.
+
+        The returned list ends with the END token. The progress callback
+        is not invoked in batch mode. Record offsets index the encoded
+        SGF bytes, so values are sliced from the bytes and decoded once.
+        """
+        data = self._sgf_bytes
+        records, n = self._lex_records()
+        tokens = []
+        for i in range(n):
+            rec = records[i]
+            value = data[rec.value_off:rec.value_off + rec.value_len]
+            tokens.append(SGFToken(SGFTokenType(rec.type), value.decode(),
+                                   rec.start, rec.end))
+        return tokens
+
+    def tokenize_all(self) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray, typing.List[str]]:
+        """Lex the entire input into SoA NumPy arrays.
+
+        Returns ``(types, starts, ends, values)`` where the first three
+        are int32 views over the token records (END token included) and
+        values is the list of decoded token strings. Consumers can scan
+        the stream with vector ops, e.g. ``(types == SGFTokenType.TAG.value)``,
+        instead of token-at-a-time Python loops.
+        """
+        data = self._sgf_bytes
+        records, n = self._lex_records()
+        arr = np.frombuffer(records, dtype=_TOKEN_RECORD_DTYPE, count=n)
+        values = [data[off:off + length].decode()
+                  for off, length in zip(arr['value_off'].tolist(),
+                                         arr['value_len'].tolist())]
+        return arr['type'], arr['start'], arr['end'], values
@@ -1,3 +1,5 @@
+import ctypes
+import queue
 import time
 from .node import SGFNode, BaseSGFNode
 from .exceptions import SGFError
@@ -5,7 +7,7 @@ from . import DynamicLibrary as dl
 from .utils import Timer, DummyTimer, TrackingTimer
 from .parser import T, NodeAllocator, DefaultNodeAllocator
 import numpy as np
-import itertools
+import concurrent.futures
 import os
 import sys
 import typing
@@ -17,17 +19,24 @@ lib = dl.DynamicLibrary(extra_compile_flags=['-I' + base_dir])
 lib.compile_string(
     r'''
 #include "parser.hpp"
+#include <algorithm>
+#include <cstdlib>
 #include <cstring>
+#include <utility>
+#include <vector>
 
 struct ParserObject {
     SGFParser* parser;
-    TrackingNodeAllocator<StringSGFNode>* allocator;
-    StringSGFNode* root;
+    ArenaNodeAllocator<ArenaSGFNode>* allocator;
+    ArenaSGFNode* root;
+    // streaming serialization cursor (see begin_serialize)
+    std::vector<std::pair<ArenaSGFNode*, int64_t>> dfs_stack;
+    int64_t next_node_index;
 };
 
 API ParserObject* create_parser(const char* sgf, size_t start, void (*progress_callback)(int, int)) {
     ParserObject* obj = new ParserObject();
-    obj->allocator = new TrackingNodeAllocator<StringSGFNode>();
+    obj->allocator = new ArenaNodeAllocator<ArenaSGFNode>();
     obj->parser = new SGFParser(sgf, *obj->allocator, start, progress_callback);
     return obj;
 }
@@ -40,24 +49,18 @@ API void delete_parser(ParserObject* obj) {
 }
 
 API void parse(ParserObject* obj) {
-    obj->root = static_cast<StringSGFNode*>(obj->parser->next_node());
+    obj->root = static_cast<ArenaSGFNode*>(obj->parser->next_node());
     while (obj->parser->next_node() != nullptr);
 }
 
+// The SoA arenas make the size queries O(1) tail reads instead of a
+// walk over every allocated node.
 API size_t calculate_tag_value_string_size(ParserObject* obj) {
-    size_t total = 0;
-    for (auto& node : obj->allocator->getAllocatedNodes()) {
-        total += node->content.size();
-    }
-    return total;
+    return obj->allocator->getArena().content_arena.size();
 }
 
 API size_t calculate_num_tag_value(ParserObject* obj) {
-    size_t total = 0;
-    for (auto& node : obj->allocator->getAllocatedNodes()) {
-        total += node->tag_value_sizes.size();
-    }
-    return total;
+    return obj->allocator->getArena().size_arena.size();
 }
 
 API size_t calculate_num_nodes(ParserObject* obj) {
@@ -67,52 +70,238 @@ API size_t calculate_num_nodes(ParserObject* obj) {
 /**
  * Convert the tree structure into a compact representation using depth-first traversal.
  *
+ * Unlike the original serialize_tree, this variant writes resolved byte
+ * offsets instead of sizes and counts, so the Python side can slice the
+ * serialized buffers directly without running cumulative sums first.
+ *
  * @param obj The parser object containing the tree structure and relevant metadata.
  * @param tag_value_string A single continuous string that holds all tag and value pairs in depth-first order.
- *                         The string is split based on the sizes provided in `tag_value_sizes`.
  *                         Size: `calculate_tag_value_string_size(obj)` returns the total size of this string.
- * @param tag_value_sizes An array of sizes corresponding to each tag or value in `tag_value_string`,
- *                        allowing correct splitting of the string into individual tags and values.
- *                        Size: `calculate_num_tag_value(obj)` returns the total number of tags and values.
- * @param is_tag A boolean (char) array indicating whether each segment in `tag_value_string` is a tag (true) or a value (false).
- *               This helps differentiate between property names and their associated values.
- *               Size: Same as `tag_value_sizes`.
- * @param tag_value_count An array that specifies how many tag-value pairs each node contains. This array helps in
- *                        reconstructing the tree structure from the linearized tag-value pairs.
- *                        Size: `calculate_num_nodes(obj)` returns the total number of nodes.
+ * @param start_offsets Byte offset into `tag_value_string` where each tag or value segment begins.
+ *                      Size: `calculate_num_tag_value(obj)` returns the total number of tags and values.
+ * @param end_offsets Byte offset into `tag_value_string` where each tag or value segment ends (exclusive).
+ *                    Size: Same as `start_offsets`.
+ * @param is_tag A packed bitmap marking which segments are tags: bit `i & 7` of
+ *               byte `i >> 3` is set when segment i is a tag, clear for a value.
+ *               Size: `(calculate_num_tag_value(obj) + 7) / 8` bytes.
+ * @param node_offsets Cumulative segment counts per node: node i owns segments
+ *                     `node_offsets[i]` to `node_offsets[i + 1]` (exclusive), with `node_offsets[0] == 0`.
+ *                     Size: `calculate_num_nodes(obj) + 1`.
  * @param parent_indices An array that stores the parent index for each node during depth-first traversal.
  *                       The root node will have a parent index of `-1`. Size: `calculate_num_nodes(obj)`.
+ * @param first_child_indices The DFS index of each node's first child, or `-1` for leaves.
+ *                            Size: `calculate_num_nodes(obj)`.
+ * @param next_sibling_indices The DFS index of each node's next sibling, or `-1` for last children.
+ *                             Size: `calculate_num_nodes(obj)`.
  */
-API void serialize_tree(ParserObject* obj, char* tag_value_string, size_t tag_value_sizes[], char is_tag[], size_t tag_value_count[], size_t parent_indices[]) {
-    // Use depth-first search (DFS) to convert the tree structure into a compact representation
+API void serialize_tree_v2(ParserObject* obj, char* tag_value_string, int64_t start_offsets[], int64_t end_offsets[], unsigned char is_tag[], int64_t node_offsets[], int64_t parent_indices[], int64_t first_child_indices[], int64_t next_sibling_indices[]) {
+    // Use depth-first search (DFS) to convert the tree structure into a
+    // compact representation. The DFS runs on an explicit stack rather
+    // than a recursive std::function: no type-erased call per node and
+    // no risk of overflowing the C stack on pathologically deep trees.
+    const SGFNodeArena& arena = obj->allocator->getArena();
     size_t offset = 0;
     size_t tag_value_index = 0;
     size_t node_index = 0;
-    std::function<void(StringSGFNode*, size_t)> dfs = [&](StringSGFNode* node, size_t parent_index) {
-        // Serialize the tag-value pairs of the current node
-        strcpy(tag_value_string + offset, node->content.c_str());  // node->content is a string that holds all tag-value pairs
-        offset += node->content.size();
-
-        // Serialize the tag-value sizes and is_tag array
-        // assert(node->tag_value_sizes.size() == node->is_tag.size());
-        for (size_t i = 0; i < node->tag_value_sizes.size(); i++) {
-            tag_value_sizes[tag_value_index] = node->tag_value_sizes[i];
-            is_tag[tag_value_index] = node->is_tag[i];
+    node_offsets[0] = 0;
+    // DFS index of the most recently visited child per parent, used to
+    // chain next_sibling_indices as siblings are discovered one by one
+    std::vector<int64_t> last_child(obj->allocator->getAllocatedNodes().size(), -1);
+    std::vector<std::pair<ArenaSGFNode*, int64_t>> stack;
+    stack.emplace_back(obj->root, -1);
+    while (!stack.empty()) {
+        ArenaSGFNode* node = stack.back().first;
+        int64_t parent_index = stack.back().second;
+        stack.pop_back();
+
+        // Serialize the tag-value pairs of the current node: one memcpy
+        // of the node's contiguous range out of the shared content arena
+        memcpy(tag_value_string + offset, arena.content_arena.data() + node->content_begin, node->content_end - node->content_begin);
+
+        // Serialize the segment offsets and is_tag array from the
+        // node's [tv_begin, tv_end) range of the shared segment arenas
+        for (size_t i = node->tv_begin; i < node->tv_end; i++) {
+            start_offsets[tag_value_index] = static_cast<int64_t>(offset);
+            offset += arena.size_arena[i];
+            end_offsets[tag_value_index] = static_cast<int64_t>(offset);
+            // segments are emitted sequentially, so each bitmap byte can
+            // be zeroed when its first bit arrives and OR-ed after that
+            if ((tag_value_index & 7) == 0) is_tag[tag_value_index >> 3] = 0;
+            if (arena.is_tag_arena[i]) is_tag[tag_value_index >> 3] |= static_cast<unsigned char>(1u << (tag_value_index & 7));
             tag_value_index++;
         }
 
-        // Serialize the node tag count and parent indices
+        // Serialize the node segment range and parent indices. Segments
+        // are emitted in node-index order, so the running tag_value_index
+        // is exactly this node's exclusive end.
         size_t current_node_index = node_index++;
-        tag_value_count[current_node_index] = node->tag_value_sizes.size();
+        node_offsets[current_node_index + 1] = static_cast<int64_t>(tag_value_index);
         parent_indices[current_node_index] = parent_index;
 
-        auto child = static_cast<StringSGFNode*>(node->child);
+        // Record the structural links: parents precede their children in
+        // the preorder traversal, so the parent's slots already exist
+        first_child_indices[current_node_index] = -1;
+        next_sibling_indices[current_node_index] = -1;
+        if (parent_index >= 0) {
+            if (last_child[parent_index] == -1) {
+                first_child_indices[parent_index] = static_cast<int64_t>(current_node_index);
+            } else {
+                next_sibling_indices[last_child[parent_index]] = static_cast<int64_t>(current_node_index);
+            }
+            last_child[parent_index] = static_cast<int64_t>(current_node_index);
+        }
+
+        // Push children in reverse so the first child is popped next,
+        // preserving the recursive traversal order
+        size_t first_child_slot = stack.size();
+        auto child = static_cast<ArenaSGFNode*>(node->child);
+        while (child != nullptr) {
+            stack.emplace_back(child, static_cast<int64_t>(current_node_index));
+            child = static_cast<ArenaSGFNode*>(child->next_sibling);
+        }
+        std::reverse(stack.begin() + first_child_slot, stack.end());
+    }
+}
+struct ParseResult {
+    char* tag_value_string;
+    int64_t* start_offsets;
+    int64_t* end_offsets;
+    unsigned char* is_tag;
+    int64_t* node_offsets;
+    int64_t* parent_indices;
+    int64_t* first_child_indices;
+    int64_t* next_sibling_indices;
+    int64_t tag_value_string_size;
+    int64_t num_tag_value;
+    int64_t num_nodes;
+};
+
+/**
+ * Parse and serialize in a single crossing: allocates the parser,
+ * parses, sizes and fills C-owned output buffers, and deletes the
+ * parser before returning. The caller wraps the buffers zero-copy and
+ * releases them with free_parse_result once done. Collapses the six
+ * create/parse/calculate/serialize/delete calls (and their GIL
+ * round-trips) into one.
+ */
+API ParseResult* parse_to_buffers(const char* sgf, size_t start) {
+    ParserObject* obj = create_parser(sgf, start, nullptr);
+    parse(obj);
+
+    ParseResult* res = new ParseResult();
+    res->tag_value_string_size = static_cast<int64_t>(calculate_tag_value_string_size(obj));
+    res->num_tag_value = static_cast<int64_t>(calculate_num_tag_value(obj));
+    res->num_nodes = static_cast<int64_t>(calculate_num_nodes(obj));
+    res->tag_value_string = static_cast<char*>(malloc(res->tag_value_string_size));
+    res->start_offsets = static_cast<int64_t*>(malloc(sizeof(int64_t) * res->num_tag_value));
+    res->end_offsets = static_cast<int64_t*>(malloc(sizeof(int64_t) * res->num_tag_value));
+    res->is_tag = static_cast<unsigned char*>(malloc((res->num_tag_value + 7) / 8));
+    res->node_offsets = static_cast<int64_t*>(malloc(sizeof(int64_t) * (res->num_nodes + 1)));
+    res->parent_indices = static_cast<int64_t*>(malloc(sizeof(int64_t) * res->num_nodes));
+    res->first_child_indices = static_cast<int64_t*>(malloc(sizeof(int64_t) * res->num_nodes));
+    res->next_sibling_indices = static_cast<int64_t*>(malloc(sizeof(int64_t) * res->num_nodes));
+    serialize_tree_v2(obj, res->tag_value_string, res->start_offsets, res->end_offsets, res->is_tag, res->node_offsets, res->parent_indices, res->first_child_indices, res->next_sibling_indices);
+
+    delete_parser(obj);
+    return res;
+}
+
+API void free_parse_result(ParseResult* res) {
+    free(res->tag_value_string);
+    free(res->start_offsets);
+    free(res->end_offsets);
+    free(res->is_tag);
+    free(res->node_offsets);
+    free(res->parent_indices);
+    free(res->first_child_indices);
+    free(res->next_sibling_indices);
+    delete res;
+}
+
+struct ChunkResult {
+    int64_t nodes;
+    int64_t segments;
+    int64_t bytes;
+    int64_t done;
+};
+
+/**
+ * Reset the streaming serialization cursor to the root of the tree.
+ * Must be called after parse() and before the first serialize_tree_chunk().
+ */
+API void begin_serialize(ParserObject* obj) {
+    obj->dfs_stack.clear();
+    obj->dfs_stack.emplace_back(obj->root, -1);
+    obj->next_node_index = 0;
+}
+
+/**
+ * Serialize the next slice of the DFS into chunk-local buffers.
+ *
+ * Writes at most `node_cap` nodes, `seg_cap` segments and `byte_cap`
+ * content bytes, then reports the amounts through `result`. Content
+ * offsets restart at zero for every chunk and node_offsets[0] == 0,
+ * but parent_indices keep their global DFS node indices, so chunks can
+ * be consumed incrementally (a parent always precedes its children).
+ *
+ * If the first pending node alone exceeds seg_cap or byte_cap, nothing
+ * is consumed and `result` carries the required capacities with
+ * result->nodes == 0, letting the caller grow its buffers and retry.
+ * result->done is set once the whole tree has been emitted.
+ */
+API void serialize_tree_chunk(ParserObject* obj, char* tag_value_string, int64_t start_offsets[], int64_t end_offsets[], unsigned char is_tag[], int64_t node_offsets[], int64_t parent_indices[], int64_t node_cap, int64_t seg_cap, int64_t byte_cap, ChunkResult* result) {
+    const SGFNodeArena& arena = obj->allocator->getArena();
+    int64_t nodes = 0;
+    int64_t segments = 0;
+    int64_t offset = 0;
+    node_offsets[0] = 0;
+    while (!obj->dfs_stack.empty() && nodes < node_cap) {
+        ArenaSGFNode* node = obj->dfs_stack.back().first;
+        int64_t parent_index = obj->dfs_stack.back().second;
+        int64_t node_segments = static_cast<int64_t>(node->tv_end - node->tv_begin);
+        int64_t node_bytes = static_cast<int64_t>(node->content_end - node->content_begin);
+        if (segments + node_segments > seg_cap || offset + node_bytes > byte_cap) {
+            if (nodes == 0) {
+                // nothing fits: report what the next node needs
+                result->nodes = 0;
+                result->segments = node_segments;
+                result->bytes = node_bytes;
+                result->done = 0;
+                return;
+            }
+            break;
+        }
+        obj->dfs_stack.pop_back();
+
+        memcpy(tag_value_string + offset, arena.content_arena.data() + node->content_begin, node_bytes);
+        for (size_t i = node->tv_begin; i < node->tv_end; i++) {
+            start_offsets[segments] = offset;
+            offset += static_cast<int64_t>(arena.size_arena[i]);
+            end_offsets[segments] = offset;
+            // chunk-local bitmap, filled sequentially like the offsets
+            if ((segments & 7) == 0) is_tag[segments >> 3] = 0;
+            if (arena.is_tag_arena[i]) is_tag[segments >> 3] |= static_cast<unsigned char>(1u << (segments & 7));
+            segments++;
+        }
+
+        int64_t current_node_index = obj->next_node_index++;
+        node_offsets[nodes + 1] = segments;
+        parent_indices[nodes] = parent_index;
+        nodes++;
+
+        // push children in reverse to preserve DFS order across chunks
+        size_t first_child_slot = obj->dfs_stack.size();
+        auto child = static_cast<ArenaSGFNode*>(node->child);
         while (child != nullptr) {
-            dfs(child, current_node_index);
-            child = static_cast<StringSGFNode*>(child->next_sibling);
+            obj->dfs_stack.emplace_back(child, current_node_index);
+            child = static_cast<ArenaSGFNode*>(child->next_sibling);
         }
-    };
-    dfs(obj->root, -1);
+        std::reverse(obj->dfs_stack.begin() + first_child_slot, obj->dfs_stack.end());
+    }
+    result->nodes = nodes;
+    result->segments = segments;
+    result->bytes = offset;
+    result->done = obj->dfs_stack.empty() ? 1 : 0;
 }
 ''', functions={
         'create_parser': {'argtypes': [dl.char_p, dl.uint64, dl.void_p], 'restype': dl.void_p},
@@ -121,15 +310,98 @@ API void serialize_tree(ParserObject* obj, char* tag_value_string, size_t tag_va
         'calculate_tag_value_string_size': {'argtypes': [dl.void_p], 'restype': dl.uint64},
         'calculate_num_tag_value': {'argtypes': [dl.void_p], 'restype': dl.uint64},
         'calculate_num_nodes': {'argtypes': [dl.void_p], 'restype': dl.uint64},
-        'serialize_tree': {'argtypes': [dl.void_p, dl.int8_p, dl.npint64arr, dl.npint8arr, dl.npint64arr, dl.npint64arr], 'restype': dl.void},
+        'serialize_tree_v2': {'argtypes': [dl.void_p, dl.int8_p, dl.npint64arr, dl.npint64arr, dl.npuint8arr, dl.npint64arr, dl.npint64arr, dl.npint64arr, dl.npint64arr], 'restype': dl.void},
+        'parse_to_buffers': {'argtypes': [dl.char_p, dl.uint64], 'restype': dl.void_p},
+        'free_parse_result': {'argtypes': [dl.void_p], 'restype': dl.void},
+        'begin_serialize': {'argtypes': [dl.void_p], 'restype': dl.void},
+        'serialize_tree_chunk': {'argtypes': [dl.void_p, dl.int8_p, dl.npint64arr, dl.npint64arr, dl.npuint8arr, dl.npint64arr, dl.npint64arr, dl.int64, dl.int64, dl.int64, dl.void_p], 'restype': dl.void},
     })
 
 
+# Mirrors the C++ `struct ParseResult` returned by parse_to_buffers
+class _ParseOut(ctypes.Structure):
+    _fields_ = [
+        ('tag_value_string', ctypes.c_void_p),
+        ('start_offsets', ctypes.c_void_p),
+        ('end_offsets', ctypes.c_void_p),
+        ('is_tag', ctypes.c_void_p),
+        ('node_offsets', ctypes.c_void_p),
+        ('parent_indices', ctypes.c_void_p),
+        ('first_child_indices', ctypes.c_void_p),
+        ('next_sibling_indices', ctypes.c_void_p),
+        ('tag_value_string_size', ctypes.c_int64),
+        ('num_tag_value', ctypes.c_int64),
+        ('num_nodes', ctypes.c_int64),
+    ]
+
+
+# Mirrors the C++ `struct ChunkResult` filled by serialize_tree_chunk
+class _ChunkOut(ctypes.Structure):
+    _fields_ = [
+        ('nodes', ctypes.c_int64),
+        ('segments', ctypes.c_int64),
+        ('bytes', ctypes.c_int64),
+        ('done', ctypes.c_int64),
+    ]
+
+
+# numba is optional: when present, the tag-index kernel below is JIT
+# compiled to a single fused pass; otherwise the pure-NumPy version
+# (flatnonzero + two searchsorted calls) serves as the fallback.
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _build_tag_index(is_tag_bits: np.ndarray, num_segments: int, node_offs: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # is_tag_bits packs one flag per segment (bit i & 7 of byte
+        # i >> 3), so the scan touches an eighth of the bytes a flat
+        # bool array would
+        num_tags = 0
+        for j in range(num_segments):
+            if (is_tag_bits[j >> 3] >> (j & 7)) & 1:
+                num_tags += 1
+        tag_positions = np.empty(num_tags, dtype=np.int64)
+        k = 0
+        for j in range(num_segments):
+            if (is_tag_bits[j >> 3] >> (j & 7)) & 1:
+                tag_positions[k] = j
+                k += 1
+        # node_offs is monotone, so one sweep over the tag positions
+        # yields every node's [lo, hi) slice of tag_positions
+        num_nodes = node_offs.shape[0] - 1
+        tag_lo = np.empty(num_nodes, dtype=np.int64)
+        tag_hi = np.empty(num_nodes, dtype=np.int64)
+        k = 0
+        for i in range(num_nodes):
+            tag_lo[i] = k
+            end = node_offs[i + 1]
+            while k < num_tags and tag_positions[k] < end:
+                k += 1
+            tag_hi[i] = k
+        return tag_positions, tag_lo, tag_hi
+else:
+    def _build_tag_index(is_tag_bits: np.ndarray, num_segments: int, node_offs: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # unpack the bitmap only here, where flatnonzero needs one
+        # element per segment; count discards any padding bits
+        flags = np.unpackbits(is_tag_bits, count=num_segments, bitorder='little')
+        tag_positions = np.flatnonzero(flags)
+        tag_lo = np.searchsorted(tag_positions, node_offs[:-1])
+        tag_hi = np.searchsorted(tag_positions, node_offs[1:])
+        return tag_positions, tag_lo, tag_hi
+
+
 class AllocateOnlyNodePool(typing.Generic[T]):
     def __init__(self, size: int, node_allocator: NodeAllocator[T]):
         self.size = size
         self.node_allocator = node_allocator
-        self.nodes: typing.List[typing.Optional[T]] = [node_allocator.allocate() for _ in range(size)]
+        # allocate_many lets the allocator batch the construction work
+        # instead of paying one allocate() call per node
+        self.nodes: typing.List[typing.Optional[T]] = list(
+            node_allocator.allocate_many(size))
         self.index = 0
 
     def allocate(self) -> T:
@@ -143,34 +415,85 @@ class AllocateOnlyNodePool(typing.Generic[T]):
 
 
 class SGFParser(typing.Generic[T]):
+    # at most producer (1) + queue (2) + consumer (1) buffer sets are
+    # ever in flight, so a larger pool could never be drawn from
+    _CHUNK_BUFFER_POOL_MAX = 4
+
     def __init__(self, node_allocator: NodeAllocator[T] = DefaultNodeAllocator()):
         self.node_allocator = node_allocator
         self.node_pool: typing.Optional[AllocateOnlyNodePool[T]] = None
         self.node_pool_thread: typing.Optional[threading.Thread] = None
-
-    def parse(self, sgf: str, start: int = 0, show_progress: bool = False) -> T:
+        # recycled streaming chunk buffers, shared across parse_streaming
+        # calls on this instance (see _take_chunk_buffers)
+        self._chunk_buffer_pool: typing.List[tuple] = []
+        self._chunk_buffer_lock = threading.Lock()
+
+    def _take_chunk_buffers(self, chunk_nodes: int, seg_cap: int, byte_cap: int) -> tuple:
+        """Borrow a chunk buffer set from the pool, allocating on a miss.
+
+        Returned sets are recycled across chunks and across
+        parse_streaming calls, so steady-state pipelines stop paying
+        allocation and page-fault cost per chunk. A pooled set is reused
+        only when every buffer meets the requested capacity; the buffers
+        are never zeroed because the C writer overwrites exactly the
+        prefix it reports back.
+        """
+        with self._chunk_buffer_lock:
+            for i, bufs in enumerate(self._chunk_buffer_pool):
+                if (len(bufs[0]) >= byte_cap and len(bufs[1]) >= seg_cap
+                        and len(bufs[4]) >= chunk_nodes + 1):
+                    del self._chunk_buffer_pool[i]
+                    return bufs
+        return (bytearray(byte_cap),
+                np.empty(seg_cap, dtype=np.int64),
+                np.empty(seg_cap, dtype=np.int64),
+                np.empty((seg_cap + 7) // 8, dtype=np.uint8),  # packed is_tag bitmap
+                np.empty(chunk_nodes + 1, dtype=np.int64),
+                np.empty(chunk_nodes, dtype=np.int64))
+
+    def _return_chunk_buffers(self, bufs: tuple) -> None:
+        with self._chunk_buffer_lock:
+            if len(self._chunk_buffer_pool) < self._CHUNK_BUFFER_POOL_MAX:
+                self._chunk_buffer_pool.append(bufs)
+
+    @staticmethod
+    def _as_bytes(sgf: typing.Union[str, bytes, bytearray, memoryview]) -> bytes:
+        # Normalize the input to bytes exactly once: a str is encoded a
+        # single time here, bytes pass through with no copy at all, and
+        # bytearray/memoryview are materialized because the C side
+        # expects a NUL-terminated buffer. Callers that already hold the
+        # file's raw bytes skip the encode entirely.
+        if isinstance(sgf, str):
+            return sgf.encode()
+        if isinstance(sgf, bytes):
+            return sgf
+        return bytes(sgf)
+
+    def parse(self, sgf: typing.Union[str, bytes, bytearray, memoryview], start: int = 0, show_progress: bool = False) -> T:
         start_time: typing.Optional[float] = None
         if show_progress:
             start_time = time.time()
 
+        sgf_bytes = self._as_bytes(sgf)
+
         # Estimate the number of nodes in the SGF file and create a node pool
         self.node_pool = None
 
         def create_node_pool() -> None:
-            nonlocal sgf
-            estimated_size = sgf.count(';')
+            estimated_size = sgf_bytes.count(b';')
             self.node_pool = AllocateOnlyNodePool(
                 estimated_size, self.node_allocator)
         self.node_pool_thread = threading.Thread(target=create_node_pool)
         self.node_pool_thread.start()
 
-        # Call the C++ parser
-        tag_value_string, tag_value_sizes, is_tag, tag_value_count, parent_indices = self._parse(
-            sgf, start, show_progress)
-
-        # Construct the tree structure from the serialized data
-        root = self._construct_tree(
-            tag_value_string, tag_value_sizes, is_tag, tag_value_count, parent_indices, show_progress)
+        # Call the C++ parser and serializer in one crossing; the
+        # buffers come back as zero-copy views over C-owned memory, so
+        # they are released only after the tree has been constructed
+        result_handle, buffers = self._parse(sgf_bytes, start, show_progress)
+        try:
+            root = self._construct_tree(*buffers, show_progress)
+        finally:
+            lib.free_parse_result(result_handle)  # type: ignore[attr-defined]
 
         if show_progress and start_time is not None:
             end_time = time.time()
@@ -178,92 +501,303 @@ class SGFParser(typing.Generic[T]):
                 f"| Total time: {end_time - start_time:.2f}s", file=sys.stderr)
         return root
 
-    def _parse(self, sgf: str, start: int = 0, show_progress: bool = False) -> typing.Tuple[bytearray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
-        Progress = DummyTimer if not show_progress else Timer
-
-        # Create the parser object
-        with Progress("[1/7] Creating parser...", end="\r"):
-            parser = lib.create_parser(sgf.encode(), start, None)  # type: ignore[attr-defined]
-
-        # Parse the SGF string
-        with Progress("[2/7] Parsing SGF...", end="\r"):
+    def parse_streaming(self, sgf: typing.Union[str, bytes, bytearray, memoryview], start: int = 0, chunk_nodes: int = 4096) -> T:
+        """Parse using the chunked producer/consumer pipeline.
+
+        A producer thread pulls fixed-size chunks of serialized nodes
+        from the C layer while this thread decodes them and links the
+        tree, so C serialization overlaps Python tree construction (the
+        chunk call releases the GIL). The bounded queue between the two
+        stages provides the backpressure: at most two chunks are in
+        flight, capping peak memory regardless of document size.
+        parse() remains the single-call batch path and is the better
+        choice for small documents.
+        """
+        sgf_bytes = self._as_bytes(sgf)
+
+        parser = lib.create_parser(sgf_bytes, start, None)  # type: ignore[attr-defined]
+        nodes: typing.List[T] = []
+        try:
             lib.parse(parser)  # type: ignore[attr-defined]
-
-        # Calculate the sizes of the tag-value string and the number of tag-value pairs
-        with Progress("[3/7] Fetching tree metadata...", end="\r"):
-            tag_value_string_size = lib.calculate_tag_value_string_size(parser)  # type: ignore[attr-defined]
-            num_tag_value = lib.calculate_num_tag_value(parser)  # type: ignore[attr-defined]
-            num_nodes = lib.calculate_num_nodes(parser)  # type: ignore[attr-defined]
-
-        # Serialize the tree structure into a compact representation
-        with Progress("[4/7] Serializing tree...", end="\r"):
-            tag_value_string = bytearray(tag_value_string_size)
-            tag_value_sizes = np.zeros(num_tag_value + 1, dtype=np.int64)
-            is_tag = np.zeros(num_tag_value, dtype=np.int8)
-            tag_value_count = np.zeros(num_nodes + 1, dtype=np.int64)
-            parent_indices = np.zeros(num_nodes, dtype=np.int64)
-            lib.serialize_tree(  # type: ignore[attr-defined]
-                parser, tag_value_string, tag_value_sizes[1:], is_tag, tag_value_count[1:], parent_indices)
-
-        # Delete the parser object
-        with Progress("[5/7] Deleting parser...", end="\r"):
+            lib.begin_serialize(parser)  # type: ignore[attr-defined]
+            chunk_queue: queue.Queue = queue.Queue(maxsize=2)
+
+            def produce() -> None:
+                try:
+                    seg_cap = chunk_nodes * 8 + 64
+                    byte_cap = 1 << 16
+                    while True:
+                        # one buffer set per chunk in flight; the
+                        # consumer returns each set to the pool once it
+                        # has finished decoding, so the sets rotate
+                        # instead of being reallocated per chunk
+                        bufs = self._take_chunk_buffers(
+                            chunk_nodes, seg_cap, byte_cap)
+                        (buf, start_offsets, end_offsets, is_tag,
+                         node_offsets, parent_indices) = bufs
+                        out = _ChunkOut()
+                        # advertise the full pooled capacities: a set
+                        # grown by an earlier retry can absorb oversized
+                        # nodes without another round trip
+                        lib.serialize_tree_chunk(  # type: ignore[attr-defined]
+                            parser, buf, start_offsets, end_offsets, is_tag,
+                            node_offsets, parent_indices,
+                            chunk_nodes, len(start_offsets), len(buf),
+                            ctypes.addressof(out))
+                        if out.nodes == 0 and not out.done:
+                            # a single node exceeds the buffers: grow to
+                            # the reported requirement and retry
+                            self._return_chunk_buffers(bufs)
+                            seg_cap = max(seg_cap, int(out.segments))
+                            byte_cap = max(byte_cap, int(out.bytes))
+                            continue
+                        chunk_queue.put((buf, start_offsets, end_offsets, is_tag,
+                                         node_offsets, parent_indices,
+                                         int(out.nodes), int(out.segments)))
+                        if out.done:
+                            break
+                    chunk_queue.put(None)
+                except BaseException as exc:  # surfaced on the consumer side
+                    chunk_queue.put(exc)
+
+            producer = threading.Thread(target=produce)
+            producer.start()
+            try:
+                while True:
+                    item = chunk_queue.get()
+                    if item is None:
+                        break
+                    if isinstance(item, BaseException):
+                        raise item
+                    self._consume_chunk(item, nodes)
+                    # _consume_chunk copies everything it keeps (decoded
+                    # strings, .tolist() snapshots), so the buffers can
+                    # go straight back into rotation
+                    self._return_chunk_buffers(item[:6])
+            finally:
+                producer.join()
+        finally:
             lib.delete_parser(parser)  # type: ignore[attr-defined]
 
-        return tag_value_string, tag_value_sizes, is_tag, tag_value_count, parent_indices
+        assert nodes
+        return nodes[0]
+
+    def _consume_chunk(self, chunk: tuple, nodes: typing.List[T]) -> None:
+        """Materialize one serialized chunk and link it into the tree."""
+        (buf, start_offsets, end_offsets, is_tag, node_offsets,
+         parent_indices, num_nodes, num_segments) = chunk
+
+        # decode this chunk's segments (offsets are chunk-local)
+        view = memoryview(buf)
+        tag_value_list = [str(view[s:e], 'utf-8')
+                          for s, e in zip(start_offsets[:num_segments].tolist(),
+                                          end_offsets[:num_segments].tolist())]
+
+        node_offs = node_offsets[:num_nodes + 1]
+        tag_positions, lo_arr, hi_arr = _build_tag_index(
+            is_tag, num_segments, node_offs)
+        tag_lo = lo_arr.tolist()
+        tag_hi = hi_arr.tolist()
+        tag_position_list = tag_positions.tolist()
+        node_offs_list = node_offs.tolist()
+
+        chunk_node_list = self.node_allocator.allocate_many(num_nodes)
+        nodes.extend(chunk_node_list)
+
+        for i in range(num_nodes):
+            e = node_offs_list[i + 1]
+            lo, hi = tag_lo[i], tag_hi[i]
+            pairs = []
+            for k in range(lo, hi):
+                p = tag_position_list[k]
+                values_end = tag_position_list[k + 1] if k + 1 < hi else e
+                pairs.append((tag_value_list[p],
+                              tag_value_list[p + 1:values_end]))
+            chunk_node_list[i].set_properties(pairs)
+
+        # Link against the global node list: parent indices are global
+        # and DFS order guarantees every parent (possibly from an
+        # earlier chunk) is already materialized. Group the batch per
+        # parent so each parent pays one attach_children call.
+        pending: typing.Dict[int, typing.List[T]] = {}
+        for i, parent_index in enumerate(parent_indices[:num_nodes].tolist()):
+            if parent_index >= 0:
+                pending.setdefault(parent_index, []).append(chunk_node_list[i])
+        for parent_index, children in pending.items():
+            nodes[parent_index].attach_children(children)
+
+    def _parse(self, sgf: bytes, start: int = 0, show_progress: bool = False) -> typing.Tuple[int, tuple]:
+        Progress = DummyTimer if not show_progress else Timer
+
+        # One crossing handles create/parse/size/serialize/delete on
+        # the C side (and releases the GIL for its whole duration)
+        # instead of six separate ctypes calls. The returned buffers are
+        # C-owned; the caller frees them via free_parse_result with the
+        # returned handle once the tree has been built.
+        with Progress("[1/3] Parsing and serializing...", end="\r"):
+            handle = lib.parse_to_buffers(sgf, start)  # type: ignore[attr-defined]
+            res = _ParseOut.from_address(handle)
+            num_tag_value = res.num_tag_value
+            num_nodes = res.num_nodes
+
+            def as_int64(addr: int, count: int) -> np.ndarray:
+                # zero-copy wrap of a C int64 buffer
+                return np.frombuffer((ctypes.c_int64 * count).from_address(addr), dtype=np.int64)
+
+            if res.tag_value_string_size > 0:
+                tag_value_string = (ctypes.c_char * res.tag_value_string_size).from_address(res.tag_value_string)
+            else:
+                tag_value_string = b''
+            if num_tag_value > 0:
+                start_offsets = as_int64(res.start_offsets, num_tag_value)
+                end_offsets = as_int64(res.end_offsets, num_tag_value)
+                is_tag_bytes = (num_tag_value + 7) // 8
+                is_tag = np.frombuffer((ctypes.c_uint8 * is_tag_bytes).from_address(res.is_tag), dtype=np.uint8)
+            else:
+                start_offsets = np.empty(0, dtype=np.int64)
+                end_offsets = np.empty(0, dtype=np.int64)
+                is_tag = np.empty(0, dtype=np.uint8)
+            node_offsets = as_int64(res.node_offsets, num_nodes + 1)
+            parent_indices = as_int64(res.parent_indices, num_nodes)
+            first_child_indices = as_int64(res.first_child_indices, num_nodes)
+            next_sibling_indices = as_int64(res.next_sibling_indices, num_nodes)
+
+        return handle, (tag_value_string, start_offsets, end_offsets, is_tag, node_offsets, parent_indices, first_child_indices, next_sibling_indices)
 
     def _construct_tree(
             self,
-            tag_value_string: bytearray,
-            tag_value_sizes: np.ndarray,
+            tag_value_string: typing.Union[bytes, bytearray, ctypes.Array],
+            start_offsets: np.ndarray,
+            end_offsets: np.ndarray,
             is_tag: np.ndarray,
-            tag_value_count: np.ndarray,
+            node_offsets: np.ndarray,
             parent_indices: np.ndarray,
+            first_child_indices: np.ndarray,
+            next_sibling_indices: np.ndarray,
             show_progress: bool = False) -> T:
         Progress = DummyTimer if not show_progress else Timer
         TrackProgress = DummyTimer if not show_progress else TrackingTimer
 
-        with Progress("[6/7] Preparing node data...", end="\r"):
-            tag_value_string_decoded = tag_value_string.decode()
-            tag_value_list = [tag_value_string_decoded[s:e] for s, e in zip(itertools.accumulate(
-                tag_value_sizes), itertools.accumulate(tag_value_sizes[1:]))]
+        with Progress("[2/3] Preparing node data...", end="\r"):
+            # Segment boundaries arrive pre-resolved from C, so the slices
+            # can be taken directly from the offset arrays.
+            starts = start_offsets.tolist()
+            ends = end_offsets.tolist()
+            # Decode segment by segment instead of decoding the whole
+            # buffer up front: the memoryview makes each slice zero-copy,
+            # and str() decodes only the bytes a segment actually owns.
+            # The segment offsets are byte offsets, so this also keeps
+            # them valid for multi-byte UTF-8 content, unlike indexing
+            # into one big decoded string.
+            view = memoryview(tag_value_string)
+            tag_value_list = [str(view[s:e], 'utf-8')
+                              for s, e in zip(starts, ends)]
 
         # Construct the tree structure
-        with TrackProgress("[7/7] Constructing tree...", len(parent_indices), end=" ") as progress:
-            # with Progress("[7/7] Constructing tree...", end=" "):
-            nodes: typing.List[typing.Optional[T]] = [None] * len(parent_indices)
-            node_tag_value_indices = zip(itertools.accumulate(
-                tag_value_count), itertools.accumulate(tag_value_count[1:]))
+        with TrackProgress("[3/3] Constructing tree...", len(parent_indices), end=" ") as progress:
+            # with Progress("[3/3] Constructing tree...", end=" "):
+            num_nodes = len(parent_indices)
+            # node_offsets is already cumulative (node i owns segments
+            # node_offsets[i]..node_offsets[i + 1])
+            node_offs = node_offsets.tolist()
+            parent_index_list = parent_indices.tolist()
+
+            # Group tags up front instead of testing is_tag[j] per segment:
+            # _build_tag_index yields every tag position plus each node's
+            # [lo, hi) slice of that position array (numba-jitted when
+            # available, vectorized NumPy otherwise). The values of tag k
+            # then sit between consecutive tag positions.
+            tag_positions, lo_arr, hi_arr = _build_tag_index(
+                is_tag, len(start_offsets), node_offsets)
+            tag_lo = lo_arr.tolist()
+            tag_hi = hi_arr.tolist()
+            tag_position_list = tag_positions.tolist()
 
             # Wait for the node pool to be created
             assert self.node_pool_thread is not None
             self.node_pool_thread.join()
             assert self.node_pool is not None
 
-            for i, ((s, e), parent_index) in enumerate(zip(node_tag_value_indices, parent_indices)):
-                node = self.node_pool.allocate()
-                nodes[i] = node
-
-                # Parse the tag-value pairs for the current node
-                tag = None
-                values = []
-                for j in range(s, e):
-                    if is_tag[j]:
-                        if tag is not None:
-                            node[tag] = values
-                            values = []
-                        tag = tag_value_list[j]
-                    else:
-                        values.append(tag_value_list[j])
-                if tag is not None:
-                    node[tag] = values
-
-                # Add the current node to its parent
-                if parent_index >= 0:
-                    parent = nodes[parent_index]
-                    parent.add_child(node)
-
-                # Update progress
-                progress.update(i + 1)
+            # Allocation stays serial (the pool index is shared state),
+            # then the property population runs chunk-parallel: each
+            # worker owns a disjoint slice of nodes, so there is no
+            # shared mutable state between chunks.
+            nodes: typing.List[T] = [self.node_pool.allocate()
+                                     for _ in range(num_nodes)]
+
+            def populate(chunk_start: int, chunk_end: int) -> None:
+                for i in range(chunk_start, chunk_end):
+                    e = node_offs[i + 1]
+                    # Assemble the (tag, values) pairs, then store the
+                    # whole batch with one set_properties call instead
+                    # of one __setitem__ per tag
+                    lo, hi = tag_lo[i], tag_hi[i]
+                    pairs = []
+                    for k in range(lo, hi):
+                        p = tag_position_list[k]
+                        values_end = tag_position_list[k + 1] if k + 1 < hi else e
+                        pairs.append((tag_value_list[p],
+                                      tag_value_list[p + 1:values_end]))
+                    nodes[i].set_properties(pairs)
+
+            num_workers = min(4, os.cpu_count() or 1)
+            if num_workers > 1 and num_nodes >= 4096:
+                chunk_size = (num_nodes + num_workers - 1) // num_workers
+                with concurrent.futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+                    futures = [executor.submit(populate, chunk_start, min(chunk_start + chunk_size, num_nodes))
+                               for chunk_start in range(0, num_nodes, chunk_size)]
+                    done = 0
+                    for future in concurrent.futures.as_completed(futures):
+                        future.result()  # re-raise worker exceptions
+                        done += 1
+                        progress.update(min(done * chunk_size, num_nodes))
+            else:
+                populate(0, num_nodes)
+                progress.update(num_nodes)
+
+            # Linking pass. The C serializer already exported the tree
+            # shape as first-child / next-sibling index arrays, so when
+            # the nodes use SGFNode's linked-list layout the pointers can
+            # be written directly: four O(1) slot writes per node, no
+            # attach_children grouping and no sibling-chain walks. Node
+            # types that override the linking methods (to keep extra
+            # bookkeeping) fall back to the CSR attach_children path so
+            # their overrides still run.
+            if (num_nodes > 0 and isinstance(nodes[0], SGFNode)
+                    and type(nodes[0]).attach_children is SGFNode.attach_children
+                    and type(nodes[0]).add_child is SGFNode.add_child):
+                first_child = first_child_indices.tolist()
+                next_sibling = next_sibling_indices.tolist()
+                num_children_list = np.bincount(
+                    parent_indices + 1, minlength=num_nodes + 1)[1:].tolist()
+                for i in range(num_nodes):
+                    node = nodes[i]
+                    p = parent_index_list[i]
+                    if p >= 0:
+                        node.parent = nodes[p]
+                    c = first_child[i]
+                    if c >= 0:
+                        node.child = nodes[c]
+                    s = next_sibling[i]
+                    if s >= 0:
+                        node.next_sibling = nodes[s]
+                    node.num_children = num_children_list[i]
+            else:
+                # CSR form: a stable argsort over the parent indices
+                # groups each parent's children contiguously while
+                # preserving their DFS (= SGF sibling) order, and a
+                # bincount cumsum gives each group's bounds. Each parent
+                # then attaches its whole batch in one attach_children
+                # call instead of one add_child tail-walk per child.
+                # Indices are shifted by one so the root's -1 lands in
+                # group 0.
+                shifted = parent_indices + 1
+                order = np.argsort(shifted, kind='stable').tolist()
+                counts = np.bincount(shifted, minlength=num_nodes + 1)
+                group_ends = np.cumsum(counts).tolist()
+                for p in np.flatnonzero(counts[1:]).tolist():
+                    lo, hi = group_ends[p], group_ends[p + 1]
+                    nodes[p].attach_children([nodes[j] for j in order[lo:hi]])
 
         root = nodes[0]
         assert root is not None
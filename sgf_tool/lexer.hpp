@@ -66,6 +66,12 @@ public:
         }
     }
 
+    void reset(std::string new_s)
+    {
+        s = std::move(new_s);
+        index = 0;
+    }
+
     int tellg() override
     {
         return index;
@@ -95,6 +101,16 @@ public:
         return last_token;
     }
 
+    // Re-initialize a pooled lexer for a new input, reusing the already
+    // allocated stream/string storage instead of constructing afresh.
+    void reset(std::string sgf, size_t start = 0, std::function<void(int, int)> new_progress_callback = nullptr)
+    {
+        length = sgf.length();
+        input_stream.reset(std::move(sgf));
+        last_token = SGFToken(SGFTokenType::NONE, "", start, start);
+        progress_callback = std::move(new_progress_callback);
+    }
+
 private:
     void _next_token()
     {
@@ -4,10 +4,18 @@ import re
 from .exceptions import LexicalError
 # from exceptions import LexicalError
 import typing
+import numpy as np
 from . import DynamicLibrary as dl
 # import DynamicLibrary as dl
 import os
 
+# numba is optional: when present, the batch tokenizer kernel below is
+# JIT compiled; the plain-Python definition doubles as the fallback.
+try:
+    import numba
+except ImportError:
+    numba = None
+
 
 class SGFTokenType(enum.Enum):
     LEFT_PAREN = 0
@@ -29,8 +37,20 @@ SGFTokenRules = [
     (SGFTokenType.IGNORE, re.compile(r'\s+')),
 ]
 
+# One master pattern built from the rules above: a single match call
+# tries every alternative in rule order (regex alternation is
+# leftmost-first, preserving the sequential-rule semantics) and
+# match.lastgroup names the rule that won.
+_SGFTokenMasterPattern = re.compile('|'.join(
+    f'(?P<{token_type.name}>{pattern.pattern})'
+    for token_type, pattern in SGFTokenRules))
+_SGFTokenIntByName = {token_type.name: token_type.value
+                      for token_type, _ in SGFTokenRules}
+
 
 class SGFToken:
+    __slots__ = ('type', 'value', 'start', 'end')
+
     def __init__(self, type: SGFTokenType, value: str, start: int, end: int):
         self.type = type
         self.value = value
@@ -46,25 +66,32 @@ class SGFLexer:
         self.progress_callback = progress_callback
 
     def next_token(self):
+        """Return the next token as a ``(type, start, end)`` int tuple.
+
+        ``type`` is the SGFTokenType value. The token text is not
+        materialized: consumers slice ``sgf[start:end]`` (or
+        ``sgf[start + 1:end - 1]`` for bracketed values) only when they
+        actually need it, so delimiter tokens cost one small tuple
+        instead of a four-attribute SGFToken object. Returns None at
+        end of input.
+        """
         if self.index >= self.length:
             return None
 
-        for token_type, pattern in SGFTokenRules:
-            match = pattern.match(self.sgf, self.index)
-            if match:
-                value = match.group(0)
-                token = SGFToken(token_type, value, self.index,
-                                 self.index + len(value))
-                self.index = token.end
+        match = _SGFTokenMasterPattern.match(self.sgf, self.index)
+        if match is None:
+            raise LexicalError('Invalid character', self.index,
+                               self.index + 1, detail=True, sgf=self.sgf)
 
-                # track progress
-                if self.progress_callback:
-                    self.progress_callback(self.index, self.length)
+        end = match.end()
+        token = (_SGFTokenIntByName[match.lastgroup], self.index, end)
+        self.index = end
 
-                return token
+        # track progress
+        if self.progress_callback:
+            self.progress_callback(self.index, self.length)
 
-        raise LexicalError('Invalid character', self.index,
-                           self.index + 1, detail=True, sgf=self.sgf)
+        return token
 
 
 class BaseInputStream:
@@ -109,6 +136,102 @@ class StringInputStream(BaseInputStream):
         return self.index
 
 
+# 256-entry byte classifier: one table lookup replaces the chained
+# ord() range comparisons per character. Delimiters keep their own
+# equality checks in the lexers (each one drives a different action);
+# the table folds the multi-branch tag-character and whitespace tests.
+_CLS_OTHER = 0
+_CLS_WS = 1
+_CLS_TAG = 2
+_CLS_DELIM = 3
+
+
+def _classify_byte(b: int) -> int:
+    if b in (0x20, 0x09, 0x0a, 0x0d):  # ' ' '\t' '\n' '\r'
+        return _CLS_WS
+    if (0x61 <= b <= 0x7a or 0x41 <= b <= 0x5a
+            or 0x30 <= b <= 0x39 or b == 0x5f):  # [a-zA-Z0-9_]
+        return _CLS_TAG
+    if b in (0x28, 0x29, 0x3b, 0x5b, 0x5d):  # '(' ')' ';' '[' ']'
+        return _CLS_DELIM
+    return _CLS_OTHER
+
+
+_CLS = bytes(_classify_byte(b) for b in range(256))
+# uint8 view of the same table for the (optionally jitted) batch kernel
+_CLS_NP = np.frombuffer(_CLS, dtype=np.uint8)
+
+
+def _scan_tokens(data: np.ndarray, token_types: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> typing.Tuple[int, int, int]:
+    """Scan a uint8 buffer into the preallocated token arrays.
+
+    Mirrors SGFLexerManual._next_token over raw bytes. Returns
+    ``(count, err_code, err_pos)`` where err_code 0 is success, 1 an
+    unterminated value and 2 an invalid character; errors are signalled
+    through the return value because the kernel must stay jittable.
+    """
+    n = data.shape[0]
+    count = 0
+    i = 0
+    while i < n:
+        c = data[i]
+        if c == 40 or c == 41 or c == 59:  # '(' ')' ';'
+            if c == 40:
+                token_types[count] = 0  # LEFT_PAREN
+            elif c == 41:
+                token_types[count] = 1  # RIGHT_PAREN
+            else:
+                token_types[count] = 2  # SEMICOLON
+            starts[count] = i
+            ends[count] = i + 1
+            count += 1
+            i += 1
+        elif c == 91:  # '['
+            i += 1
+            value_len = 0
+            escape = False
+            closed = False
+            while i < n:
+                c = data[i]
+                if c == 93 and not escape:  # ']'
+                    closed = True
+                    i += 1
+                    break
+                if c == 92 and not escape:  # '\\'
+                    escape = True
+                    i += 1
+                    continue
+                value_len += 1
+                escape = False
+                i += 1
+            if not closed:
+                return count, 1, i
+            token_types[count] = 5  # VALUE
+            # same convention as _next_token: start points at the first
+            # value byte counted without escape backslashes
+            starts[count] = i - value_len - 1
+            ends[count] = i
+            count += 1
+        elif _CLS_NP[c] == 2:  # _CLS_TAG
+            start = i
+            i += 1
+            while i < n and _CLS_NP[data[i]] == 2:
+                i += 1
+            token_types[count] = 3  # TAG
+            starts[count] = start
+            ends[count] = i
+            count += 1
+        elif _CLS_NP[c] == 1:  # _CLS_WS
+            i += 1
+        else:
+            return count, 2, i
+    return count, 0, 0
+
+
+if numba is not None:
+    _scan_tokens = numba.njit(cache=True)(_scan_tokens)
+
+
 class SGFLexerManual:
     def __init__(self, sgf: str, start: int = 0, progress_callback: typing.Optional[typing.Callable[[int, int], None]] = None):
         self.length = len(sgf)
@@ -123,6 +246,29 @@ class SGFLexerManual:
             self.progress_callback(self.input_stream.tellg(), self.length)
         return token
 
+    def tokenize_all(self) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Tokenize the whole input into SoA NumPy arrays in one pass.
+
+        Returns ``(token_types, starts, ends)``; the offsets index the
+        UTF-8 encoding of the input and follow the same conventions as
+        the tokens from next_token. The scan runs as a numba-jitted
+        kernel when numba is installed and as plain Python otherwise.
+        The progress callback is not invoked in batch mode.
+        """
+        data = np.frombuffer(self.input_stream.s.encode(), dtype=np.uint8)
+        # every token consumes at least one byte, so len(data) bounds the count
+        token_types = np.empty(len(data), dtype=np.int32)
+        starts = np.empty(len(data), dtype=np.int64)
+        ends = np.empty(len(data), dtype=np.int64)
+        count, err_code, err_pos = _scan_tokens(data, token_types, starts, ends)
+        if err_code == 1:
+            raise LexicalError('Unexpected end of file',
+                               err_pos, err_pos, detail=True)
+        if err_code == 2:
+            raise LexicalError('Invalid character',
+                               err_pos, err_pos + 1, detail=True)
+        return token_types[:count], starts[:count], ends[:count]
+
     def _next_token(self):
         while True:
             c = self.input_stream.get()
@@ -135,8 +281,13 @@ class SGFLexerManual:
             if c == ';':
                 return SGFToken(SGFTokenType.SEMICOLON, c, self.input_stream.tellg() - 1, self.input_stream.tellg())
             if c == '[':
-                value = ''
+                # Scan for the terminator only, then take the value as
+                # one slice: no per-character string concatenation. The
+                # escape backslashes are stripped in a single pass at the
+                # end, and only when the value actually contains any.
+                value_start = self.input_stream.tellg()
                 escape = False
+                has_escape = False
                 while True:
                     c = self.input_stream.get()
                     if c == '':
@@ -146,22 +297,33 @@ class SGFLexerManual:
                         break
                     if c == '\\' and not escape:
                         escape = True
+                        has_escape = True
                         continue
-                    value += c
                     escape = False
-                return SGFToken(SGFTokenType.VALUE, value, self.input_stream.tellg() - len(value) - 1, self.input_stream.tellg())
-            if ord('a') <= ord(c) <= ord('z') or ord('A') <= ord(c) <= ord('Z') or ord('0') <= ord(c) <= ord('9') or c == '_':
-                tag = c
+                end = self.input_stream.tellg()
+                value = self.input_stream.s[value_start:end - 1]
+                if has_escape:
+                    value = re.sub(r'\\(.)', r'\1', value, flags=re.S)
+                return SGFToken(SGFTokenType.VALUE, value, end - len(value) - 1, end)
+            code = ord(c)
+            cls = _CLS[code] if code < 256 else _CLS_OTHER
+            if cls == _CLS_TAG:
+                # Advance past the tag characters and slice the tag out
+                # in one go instead of appending char by char
+                tag_start = self.input_stream.tellg() - 1
                 while True:
                     c = self.input_stream.peek()
                     if c == '':
                         break
-                    if ord('a') <= ord(c) <= ord('z') or ord('A') <= ord(c) <= ord('Z') or ord('0') <= ord(c) <= ord('9') or c == '_':
-                        tag += self.input_stream.get()
+                    code = ord(c)
+                    if code < 256 and _CLS[code] == _CLS_TAG:
+                        self.input_stream.get()
                     else:
                         break
-                return SGFToken(SGFTokenType.TAG, tag, self.input_stream.tellg() - len(tag), self.input_stream.tellg())
-            if c == ' ' or c == '\t' or c == '\n' or c == '\r':
+                end = self.input_stream.tellg()
+                tag = self.input_stream.s[tag_start:end]
+                return SGFToken(SGFTokenType.TAG, tag, tag_start, end)
+            if cls == _CLS_WS:
                 continue
             raise LexicalError('Invalid character', self.input_stream.tellg(
             ) - 1, self.input_stream.tellg(), detail=True)
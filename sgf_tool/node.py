@@ -4,6 +4,8 @@ import typing
 
 
 class BaseSGFNode(abc.ABC):
+    __slots__ = ()
+
     @abc.abstractmethod
     def __setitem__(self, key, value) -> None:
         pass
@@ -83,8 +85,44 @@ class BaseSGFNode(abc.ABC):
             assert child is not None
             yield child
 
+    def get_children(self) -> typing.List['BaseSGFNode']:
+        """
+        Get all children as a list in one call.
+        """
+        return list(self.get_children_iter())
+
+    def attach_children(self, children: typing.List['BaseSGFNode']) -> None:
+        """
+        Attach a list of nodes as the last children of this node.
+
+        Equivalent to calling add_child() once per node; subclasses can
+        override it to wire the whole batch in one pass.
+        """
+        # Warning:
+        #   This method is not abstract, but it is highly recommended to
+        #   override it. By default it falls back to per-child add_child().
+        for child in children:
+            self.add_child(child)
+
+    def set_properties(self, pairs: typing.Iterable[typing.Tuple[str, typing.List[str]]]) -> None:
+        """
+        Set many properties in one call from (tag, values) pairs.
+
+        Equivalent to `self[tag] = values` per pair; subclasses can
+        override it to store the whole batch at once. The value lists
+        are handed over to the node, so callers must not mutate them
+        afterwards.
+        """
+        # Warning:
+        #   This method is not abstract, but it is highly recommended to
+        #   override it. By default it falls back to per-key __setitem__.
+        for tag, values in pairs:
+            self[tag] = values
+
 
 class SGFNode(BaseSGFNode):
+    __slots__ = ('parent', 'child', 'next_sibling', 'num_children', 'properties')
+
     def __init__(self):
         self.parent: typing.Optional[SGFNode] = None
         self.child: typing.Optional[SGFNode] = None
@@ -101,6 +139,11 @@ class SGFNode(BaseSGFNode):
     def __getitem__(self, key):
         return self.properties[key]
 
+    def set_properties(self, pairs):
+        # one C-level dict update instead of a __setitem__ call per key;
+        # the value lists are stored as-is (ownership passes to the node)
+        self.properties.update(pairs)
+
     def __contains__(self, key):
         return key in self.properties
 
@@ -151,6 +194,27 @@ class SGFNode(BaseSGFNode):
         child.parent = self
         self.num_children += 1
 
+    def attach_children(self, children):
+        # Wire the sibling chain directly: one tail walk for the whole
+        # batch instead of one per child as repeated add_child() would do
+        prev = None
+        for child in children:
+            child.detach()
+            child.parent = self
+            if prev is not None:
+                prev.next_sibling = child
+            prev = child
+        if prev is None:
+            return
+        if self.child is None:
+            self.child = children[0]
+        else:
+            ptr = self.child
+            while ptr.next_sibling:
+                ptr = ptr.next_sibling
+            ptr.next_sibling = children[0]
+        self.num_children += len(children)
+
     def detach(self):
         if self.parent:
             if self.parent.child == self:
@@ -2,6 +2,8 @@
 
 #include "exceptions.hpp"
 #include "lexer.hpp"
+#include <algorithm>
+#include <cstdint>
 #include <stack>
 #include <stdexcept>
 #include <string>
@@ -79,6 +81,52 @@ public:
     std::vector<bool> is_tag;
 };
 
+// Structure-of-arrays storage for serialization: every node's content
+// bytes are appended to one shared string and every segment size /
+// is_tag flag to one shared vector, so streaming the tree out walks
+// three contiguous allocations instead of three per node.
+struct SGFNodeArena {
+    std::string content_arena;
+    std::vector<uint64_t> size_arena;
+    std::vector<uint8_t> is_tag_arena;
+};
+
+class ArenaSGFNode : public BaseSGFNode {
+public:
+    ArenaSGFNode() : BaseSGFNode(), arena(nullptr), content_begin(0), content_end(0), tv_begin(0), tv_end(0) {}
+
+    void addProperty(const std::string& tag, const std::vector<std::string>& values) override
+    {
+        SGFNodeArena& a = *arena;
+        if (tv_begin == tv_end) {
+            // First property of this node: anchor its ranges at the
+            // current arena tails. The parser hands every property of a
+            // node over before touching the next node, so the ranges
+            // stay contiguous.
+            content_begin = a.content_arena.size();
+            content_end = content_begin;
+            tv_begin = a.size_arena.size();
+            tv_end = tv_begin;
+        }
+        a.content_arena += tag;
+        a.size_arena.push_back(tag.size());
+        a.is_tag_arena.push_back(1);
+        for (const std::string& value : values) {
+            a.content_arena += value;
+            a.size_arena.push_back(value.size());
+            a.is_tag_arena.push_back(0);
+        }
+        content_end = a.content_arena.size();
+        tv_end = a.size_arena.size();
+    }
+
+    SGFNodeArena* arena;
+    size_t content_begin; // [content_begin, content_end) into content_arena
+    size_t content_end;
+    size_t tv_begin; // [tv_begin, tv_end) into size_arena / is_tag_arena
+    size_t tv_end;
+};
+
 class BaseNodeAllocator {
 public:
     virtual BaseSGFNode* allocate() = 0;
@@ -134,6 +182,51 @@ private:
     std::unordered_set<NodeType*> allocated_nodes;
 };
 
+template <typename NodeType>
+class ArenaNodeAllocator : public BaseNodeAllocator {
+public:
+    BaseSGFNode* allocate() override
+    {
+        NodeType* node = new NodeType();
+        node->arena = &arena;
+        allocated_nodes.push_back(node);
+        return node;
+    }
+
+    void deallocate(BaseSGFNode* node) override
+    {
+        auto it = std::find(allocated_nodes.begin(), allocated_nodes.end(), static_cast<NodeType*>(node));
+        if (it != allocated_nodes.end()) {
+            allocated_nodes.erase(it);
+            delete static_cast<NodeType*>(node);
+        }
+    }
+
+    // allocation order is document order, i.e. DFS preorder of the tree
+    const std::vector<NodeType*>& getAllocatedNodes() const
+    {
+        return allocated_nodes;
+    }
+
+    SGFNodeArena& getArena()
+    {
+        return arena;
+    }
+
+    void deallocateAll()
+    {
+        for (NodeType* node : allocated_nodes) {
+            delete node;
+        }
+        allocated_nodes.clear();
+        arena = SGFNodeArena();
+    }
+
+private:
+    SGFNodeArena arena;
+    std::vector<NodeType*> allocated_nodes;
+};
+
 class SGFParser {
     class DummyNode : public BaseSGFNode {
     public:
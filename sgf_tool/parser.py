@@ -1,6 +1,7 @@
-from .lexer import SGFLexer, SGFToken, SGFTokenType
+from .lexer import SGFLexer, SGFTokenType
 from .node import SGFNode, BaseSGFNode
 from .exceptions import SGFError
+from collections import OrderedDict
 import typing
 
 # Type variable for custom node types, bounded by BaseSGFNode
@@ -11,14 +12,39 @@ class NodeAllocator(typing.Generic[T]):
     def allocate(self) -> T:
         raise NotImplementedError()
 
+    def allocate_many(self, count: int) -> typing.List[T]:
+        """
+        Allocate `count` nodes in one call.
+
+        The default implementation just loops allocate(); allocators can
+        override it with a cheaper bulk path.
+        """
+        return [self.allocate() for _ in range(count)]
+
 
 class DefaultNodeAllocator(NodeAllocator[SGFNode]):
     def allocate(self) -> SGFNode:
         return SGFNode()
 
+    def allocate_many(self, count: int) -> typing.List[SGFNode]:
+        # Create bare instances and initialize the slots inline: the
+        # listcomp over __new__ skips one __init__ call frame per node,
+        # which is most of the per-node cost when allocating in bulk
+        new = SGFNode.__new__
+        nodes = [new(SGFNode) for _ in range(count)]
+        for node in nodes:
+            node.parent = None
+            node.child = None
+            node.next_sibling = None
+            node.num_children = 0
+            node.properties = OrderedDict()
+        return nodes
+
 
 class SGFParser(typing.Generic[T]):
     class __DummyNode(SGFNode):
+        __slots__ = ()
+
         def __init__(self):
             super().__init__()
 
@@ -46,7 +72,17 @@ class SGFParser(typing.Generic[T]):
         lexer = SGFLexer(sgf, start, progress_callback)
         root = self.__DummyNode()  # dummy root
         current: BaseSGFNode = root
-        stack: typing.List[typing.Union[BaseSGFNode, SGFToken]] = []
+        # the stack mixes nodes and raw (type, start, end) token tuples
+        stack: typing.List[typing.Union[BaseSGFNode, typing.Tuple[int, int, int]]] = []
+
+        # the lexer yields int token types; bind them once as locals
+        LEFT_PAREN = SGFTokenType.LEFT_PAREN.value
+        RIGHT_PAREN = SGFTokenType.RIGHT_PAREN.value
+        SEMICOLON = SGFTokenType.SEMICOLON.value
+        TAG = SGFTokenType.TAG.value
+        EMPTY_VALUE = SGFTokenType.EMPTY_VALUE.value
+        VALUE = SGFTokenType.VALUE.value
+        IGNORE = SGFTokenType.IGNORE.value
 
         # cache data
         cache_tag: str = ''  # will be set before cache_values is used
@@ -63,11 +99,12 @@ class SGFParser(typing.Generic[T]):
             token = lexer.next_token()
             if token is None:
                 break
+            token_type, token_start, token_end = token
 
-            if token.type == SGFTokenType.LEFT_PAREN:
+            if token_type == LEFT_PAREN:
                 if not next_can_be_left_paren:
                     raise SGFError('Unexpected left parentheses',
-                                   token.start, token.end, detail=True, sgf=sgf)
+                                   token_start, token_end, detail=True, sgf=sgf)
 
                 stack.append(current)
                 stack.append(token)  # append '(' token to stack
@@ -79,14 +116,14 @@ class SGFParser(typing.Generic[T]):
                 next_can_be_tag = False
                 next_can_be_value = False
 
-            elif token.type == SGFTokenType.RIGHT_PAREN:
+            elif token_type == RIGHT_PAREN:
                 if not next_can_be_right_paren:
                     raise SGFError('Unexpected right parentheses',
-                                   token.start, token.end, detail=True, sgf=sgf)
+                                   token_start, token_end, detail=True, sgf=sgf)
 
                 if len(stack) == 0:
                     raise SGFError('Unmatched right parentheses',
-                                   token.start, token.end, detail=True, sgf=sgf)
+                                   token_start, token_end, detail=True, sgf=sgf)
 
                 # store tag and value to current node if needed
                 if cache_values is not None:
@@ -98,9 +135,9 @@ class SGFParser(typing.Generic[T]):
                 while True:
                     if len(stack) == 0:
                         raise SGFError('Unmatched right parentheses',
-                                       token.start, token.end, detail=True, sgf=sgf)
-                    # check stack[-1] is a token first
-                    if isinstance(stack[-1], SGFToken) and stack[-1].type == SGFTokenType.LEFT_PAREN:
+                                       token_start, token_end, detail=True, sgf=sgf)
+                    # check stack[-1] is a token tuple first
+                    if isinstance(stack[-1], tuple) and stack[-1][0] == LEFT_PAREN:
                         stack.pop()  # pop '(' token
                         break
                     stack.pop()  # pop node
@@ -115,10 +152,10 @@ class SGFParser(typing.Generic[T]):
                 next_can_be_tag = False
                 next_can_be_value = False
 
-            elif token.type == SGFTokenType.SEMICOLON:
+            elif token_type == SEMICOLON:
                 if not next_can_be_semicolon:
                     raise SGFError('Unexpected semicolon',
-                                   token.start, token.end, detail=True, sgf=sgf)
+                                   token_start, token_end, detail=True, sgf=sgf)
 
                 # store tag and value to current node if needed
                 if cache_values is not None:
@@ -139,17 +176,18 @@ class SGFParser(typing.Generic[T]):
                 next_can_be_tag = True
                 next_can_be_value = False
 
-            elif token.type == SGFTokenType.TAG:
+            elif token_type == TAG:
                 if not next_can_be_tag:
                     raise SGFError(
-                        f'Unexpected tag {token.value}', token.start, token.end, detail=True, sgf=sgf)
+                        f'Unexpected tag {sgf[token_start:token_end]}', token_start, token_end, detail=True, sgf=sgf)
 
                 # store tag and value to current node if needed
                 if cache_values is not None:
                     current[cache_tag] = cache_values
                     cache_values = None
 
-                cache_tag = token.value  # cache the tag, will be used when the value comes
+                # cache the tag, will be used when the value comes
+                cache_tag = sgf[token_start:token_end]
 
                 # update states
                 next_can_be_left_paren = False
@@ -158,14 +196,16 @@ class SGFParser(typing.Generic[T]):
                 next_can_be_tag = False
                 next_can_be_value = True
 
-            elif token.type == SGFTokenType.VALUE or token.type == SGFTokenType.EMPTY_VALUE:
+            elif token_type == VALUE or token_type == EMPTY_VALUE:
                 if not next_can_be_value:
                     raise SGFError(
-                        f'Unexpected value {token.value}', token.start, token.end, detail=True, sgf=sgf)
+                        f'Unexpected value {sgf[token_start:token_end]}', token_start, token_end, detail=True, sgf=sgf)
 
                 if cache_values is None:
                     cache_values = []
-                value = token.value[1:-1]
+                # slice the value out of the input, brackets excluded;
+                # this is the only token text the parser materializes
+                value = sgf[token_start + 1:token_end - 1]
                 cache_values.append(value)
 
                 # update states
@@ -175,24 +215,24 @@ class SGFParser(typing.Generic[T]):
                 next_can_be_tag = True
                 next_can_be_value = True
 
-            elif token.type == SGFTokenType.IGNORE:
+            elif token_type == IGNORE:
                 pass
             else:
                 raise SGFError(
-                    f'Invalid token {token.value}', token.start, token.end, detail=True, sgf=sgf)
+                    f'Invalid token {sgf[token_start:token_end]}', token_start, token_end, detail=True, sgf=sgf)
 
         # make sure all the parentheses are matched
         if len(stack) > 0:
             # pop until the first '(' token
-            last_left_paren: typing.Optional[SGFToken] = None
+            last_left_paren: typing.Optional[typing.Tuple[int, int, int]] = None
             while len(stack) > 0:
                 item = stack.pop()
-                if isinstance(item, SGFToken) and item.type == SGFTokenType.LEFT_PAREN:
+                if isinstance(item, tuple) and item[0] == LEFT_PAREN:
                     last_left_paren = item
                     break
             if last_left_paren is not None:
-                raise SGFError('Unmatched left parentheses', last_left_paren.start,
-                               last_left_paren.end, detail=True, sgf=sgf)
+                raise SGFError('Unmatched left parentheses', last_left_paren[1],
+                               last_left_paren[2], detail=True, sgf=sgf)
             else:
                 raise SGFError('Unmatched parentheses', 0,
                                len(sgf), detail=True, sgf=sgf)